@@ -3,7 +3,7 @@
 import os
 from flask import Flask, render_template
 from .config import config
-from .extensions import db, migrate, login_manager, bcrypt, csrf, mail
+from .extensions import db, migrate, login_manager, bcrypt, csrf, mail, cache
 
 
 def create_app(config_name=None):
@@ -21,6 +21,7 @@ def create_app(config_name=None):
     bcrypt.init_app(app)
     csrf.init_app(app)
     mail.init_app(app)
+    cache.init_app(app)
     
     # Create upload directories
     upload_dirs = ['bakeries', 'products', 'profiles']
@@ -32,12 +33,18 @@ def create_app(config_name=None):
     from .routes import register_blueprints
     register_blueprints(app)
     
+    # Register CLI commands (`flask create-search-indexes` applies to PostgreSQL only)
+    from .commands import register_commands
+    register_commands(app)
+    
     # User loader for Flask-Login
+    from sqlalchemy.orm import joinedload
     from .models import User
     
     @login_manager.user_loader
     def load_user(user_id):
-        return User.query.get(int(user_id))
+        # Baker views read current_user.bakery on every request
+        return User.query.options(joinedload(User.bakery)).get(int(user_id))
     
     # Error handlers
     @app.errorhandler(404)
@@ -57,10 +64,15 @@ def create_app(config_name=None):
     @app.context_processor
     def inject_globals():
         from .models import CartItem
+        from flask import g
         from flask_login import current_user
         cart_count = 0
         if current_user.is_authenticated:
-            cart_count = CartItem.query.filter_by(user_id=current_user.id).count()
+            # Reuse cart items already loaded during this request
+            if 'cart_items' in g:
+                cart_count = len(g.cart_items)
+            else:
+                cart_count = CartItem.query.filter_by(user_id=current_user.id).count()
         return dict(cart_count=cart_count)
     
     return app
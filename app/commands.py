@@ -0,0 +1,36 @@
+"""Flask CLI commands."""
+
+import click
+from flask import Flask
+from sqlalchemy import text
+from app.extensions import db
+
+# Trigram indexes let PostgreSQL serve the ilike('%q%') searches from an index. There is
+# no equivalent on SQLite or MySQL (FULLTEXT only serves MATCH ... AGAINST, not LIKE), so
+# on the current MySQL deployment these searches still scan the tables
+SEARCH_INDEX_DDL = (
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS ix_bakeries_name_trgm ON bakeries USING gin (name gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS ix_bakeries_description_trgm ON bakeries USING gin (description gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS ix_bakeries_city_trgm ON bakeries USING gin (city gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS ix_products_name_trgm ON products USING gin (name gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS ix_products_description_trgm ON products USING gin (description gin_trgm_ops)',
+)
+
+
+def register_commands(app: Flask):
+    """Register CLI commands with the application."""
+    
+    @app.cli.command('create-search-indexes')
+    def create_search_indexes():
+        """Create the pg_trgm search indexes (PostgreSQL only; safe to re-run).
+        
+        Has no effect on SQLite or MySQL, including the current deployment.
+        """
+        if db.engine.dialect.name != 'postgresql':
+            raise click.ClickException(
+                f'Trigram search indexes are PostgreSQL-only; nothing to do on {db.engine.dialect.name}.')
+        with db.engine.begin() as conn:
+            for statement in SEARCH_INDEX_DDL:
+                conn.execute(text(statement))
+        click.echo(f'Applied {len(SEARCH_INDEX_DDL)} search index statements.')
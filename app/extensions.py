@@ -6,6 +6,7 @@ from flask_login import LoginManager
 from flask_bcrypt import Bcrypt
 from flask_wtf.csrf import CSRFProtect
 from flask_mail import Mail
+from flask_caching import Cache
 
 # Initialize extensions
 db = SQLAlchemy()
@@ -14,6 +15,7 @@ login_manager = LoginManager()
 bcrypt = Bcrypt()
 csrf = CSRFProtect()
 mail = Mail()
+cache = Cache()
 
 # Configure login manager
 login_manager.login_view = 'auth.login'
@@ -2,7 +2,9 @@
 
 from datetime import datetime
 from slugify import slugify
+from sqlalchemy import func, or_
 from app.extensions import db
+from .review import Review
 
 
 class Bakery(db.Model):
@@ -51,22 +53,29 @@ class Bakery(db.Model):
     def generate_slug(self):
         """Generate a unique slug for the bakery."""
         base_slug = slugify(self.name) if self.name else 'bakery'
+        # Load every taken variant of the base slug at once instead of probing each candidate
+        taken = set(db.session.scalars(db.select(Bakery.slug).where(or_(
+            Bakery.slug == base_slug,
+            Bakery.slug.like(f'{base_slug}-%')
+        ))))
         slug = base_slug
         counter = 1
-        while Bakery.query.filter_by(slug=slug).first() is not None:
+        while slug in taken:
             slug = f"{base_slug}-{counter}"
             counter += 1
         self.slug = slug
     
     def update_rating(self):
         """Update bakery rating based on reviews."""
-        reviews = self.reviews.filter_by(is_visible=True).all()
-        if reviews:
-            self.rating = sum(r.rating for r in reviews) / len(reviews)
-            self.total_reviews = len(reviews)
-        else:
-            self.rating = 0.0
-            self.total_reviews = 0
+        rating, total = self.reviews.filter_by(is_visible=True).with_entities(
+            func.avg(Review.rating), func.count(Review.id)
+        ).one()
+        self.rating = float(rating or 0.0)
+        self.total_reviews = total
+    
+    def touch(self):
+        """Mark the bakery as changed so cached pages are refreshed."""
+        self.updated_at = datetime.utcnow()
     
     def get_available_products(self):
         """Get all available products."""
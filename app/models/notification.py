@@ -1,12 +1,15 @@
 """Notification model."""
 
 from datetime import datetime
-from app.extensions import db
+from app.extensions import db, cache
 
 
 class Notification(db.Model):
     """User notifications."""
     __tablename__ = 'notifications'
+    __table_args__ = (
+        db.Index('ix_notifications_user_created', 'user_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -37,5 +40,30 @@ class Notification(db.Model):
             link=f'/orders/{order_number}'
         )
     
+    @staticmethod
+    def unread_count(user_id):
+        """Get the number of unread notifications, cached per user."""
+        key = f'notif:unread:{user_id}'
+        count = cache.get(key)
+        if count is None:
+            count = Notification.query.filter_by(user_id=user_id, is_read=False).count()
+            cache.set(key, count, timeout=30)
+        return count
+    
+    @staticmethod
+    def total_count(user_id):
+        """Get the total number of notifications, cached per user."""
+        key = f'notif:total:{user_id}'
+        count = cache.get(key)
+        if count is None:
+            count = Notification.query.filter_by(user_id=user_id).count()
+            cache.set(key, count, timeout=60)
+        return count
+    
+    @staticmethod
+    def clear_counts(user_id):
+        """Drop the cached counts after notifications change."""
+        cache.delete_many(f'notif:unread:{user_id}', f'notif:total:{user_id}')
+    
     def __repr__(self):
         return f'<Notification {self.title}>'
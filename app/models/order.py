@@ -8,6 +8,10 @@ from app.extensions import db
 class Order(db.Model):
     """Order model."""
     __tablename__ = 'orders'
+    __table_args__ = (
+        # Serves the keyset-paginated order history
+        db.Index('ix_orders_customer_created_id', 'customer_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     order_number = db.Column(db.String(50), unique=True, nullable=False, index=True)
@@ -1,6 +1,8 @@
 """Product model."""
 
 from datetime import datetime
+from sqlalchemy import case, and_
+from sqlalchemy.ext.hybrid import hybrid_property
 from app.extensions import db
 
 
@@ -30,13 +32,21 @@ class Product(db.Model):
     order_items = db.relationship('OrderItem', backref='product', lazy='dynamic')
     reviews = db.relationship('Review', backref='product', lazy='dynamic')
     
-    @property
+    @hybrid_property
     def current_price(self):
         """Get the current effective price."""
         if self.discount_price and self.discount_price < self.price:
             return self.discount_price
         return self.price
     
+    @current_price.expression
+    def current_price(cls):
+        """SQL form of current_price for use in queries."""
+        return case(
+            (and_(cls.discount_price != 0, cls.discount_price < cls.price), cls.discount_price),
+            else_=cls.price
+        )
+    
     @property
     def discount_percentage(self):
         """Calculate discount percentage."""
@@ -9,6 +9,14 @@ class User(UserMixin, db.Model):
     """User model for customers, bakers, and admins."""
     __tablename__ = 'users'
     
+    # Bits of role_flags
+    FLAG_AUTH = 1
+    FLAG_CUSTOMER = 2
+    FLAG_BAKER = 4
+    FLAG_ADMIN = 8
+    FLAG_BAKERY_APPROVED = 16
+    ROLE_FLAGS = {'customer': FLAG_CUSTOMER, 'baker': FLAG_BAKER, 'admin': FLAG_ADMIN}
+    
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
     password_hash = db.Column(db.String(255), nullable=False)
@@ -51,6 +59,14 @@ class User(UserMixin, db.Model):
         """Check if user is a customer."""
         return self.role == 'customer'
     
+    @property
+    def role_flags(self):
+        """Authentication, role and bakery approval packed into one bitmask."""
+        flags = self.FLAG_AUTH | self.ROLE_FLAGS.get(self.role, 0)
+        if self.role == 'baker' and self.bakery and self.bakery.is_approved:
+            flags |= self.FLAG_BAKERY_APPROVED
+        return flags
+    
     def get_default_address(self):
         """Get user's default delivery address."""
         return self.addresses.filter_by(is_default=True).first()
@@ -158,6 +158,7 @@ def approve_bakery(bakery_id):
     )
     db.session.add(notification)
     db.session.commit()
+    Notification.clear_counts(bakery.owner_id)
     
     flash(f'Bakery "{bakery.name}" has been approved!', 'success')
     return redirect(url_for('admin.pending_approvals'))
@@ -181,8 +182,10 @@ def reject_bakery(bakery_id):
     db.session.add(notification)
     
     # Delete bakery and user
+    owner_id = bakery.owner_id
     db.session.delete(bakery)
     db.session.commit()
+    Notification.clear_counts(owner_id)
     
     flash(f'Bakery application rejected.', 'info')
     return redirect(url_for('admin.pending_approvals'))
@@ -350,10 +353,10 @@ def delete_review(review_id):
     bakery = review.bakery
     
     db.session.delete(review)
-    db.session.commit()
     
     # Update bakery rating after deletion
     bakery.update_rating()
+    db.session.commit()
     
     flash('Review deleted successfully.', 'success')
     return redirect(url_for('admin.reviews'))
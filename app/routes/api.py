@@ -126,10 +126,7 @@ def get_notifications():
         user_id=current_user.id
     ).order_by(Notification.created_at.desc()).limit(10).all()
     
-    unread_count = Notification.query.filter_by(
-        user_id=current_user.id,
-        is_read=False
-    ).count()
+    unread_count = Notification.unread_count(current_user.id)
     
     return jsonify({
         'notifications': [{
@@ -165,6 +162,7 @@ def mark_notifications_read():
         ).update({'is_read': True})
     
     db.session.commit()
+    Notification.clear_counts(current_user.id)
     return jsonify({'success': True})
 
 
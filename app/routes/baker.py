@@ -163,6 +163,7 @@ def add_category():
         display_order=Category.query.filter_by(bakery_id=current_user.bakery.id).count()
     )
     db.session.add(category)
+    current_user.bakery.touch()
     db.session.commit()
     
     flash('Category added!', 'success')
@@ -183,6 +184,7 @@ def edit_category(category_id):
     if request.method == 'POST':
         category.name = request.form.get('name')
         category.is_active = request.form.get('is_active') == 'on'
+        current_user.bakery.touch()
         db.session.commit()
         
         flash('Category updated!', 'success')
@@ -207,6 +209,7 @@ def delete_category(category_id):
     Product.query.filter_by(category_id=category_id).update({'category_id': None})
     
     db.session.delete(category)
+    current_user.bakery.touch()
     db.session.commit()
     
     flash('Category deleted!', 'success')
@@ -274,6 +277,7 @@ def add_product():
                     product.image_url = filename
         
         db.session.add(product)
+        current_user.bakery.touch()
         db.session.commit()
         
         flash('Product added successfully!', 'success')
@@ -316,6 +320,7 @@ def edit_product(product_id):
                 if filename:
                     product.image_url = filename
         
+        current_user.bakery.touch()
         db.session.commit()
         flash('Product updated successfully!', 'success')
         return redirect(url_for('baker.products'))
@@ -335,6 +340,7 @@ def delete_product(product_id):
     ).first_or_404()
     
     db.session.delete(product)
+    current_user.bakery.touch()
     db.session.commit()
     
     flash('Product deleted!', 'success')
@@ -352,6 +358,7 @@ def toggle_product(product_id):
     ).first_or_404()
     
     product.is_available = not product.is_available
+    current_user.bakery.touch()
     db.session.commit()
     
     status = 'available' if product.is_available else 'unavailable'
@@ -434,6 +441,7 @@ def update_order_status(order_id):
         db.session.add(notification)
         
         db.session.commit()
+        Notification.clear_counts(order.customer_id)
         flash(f'Order status updated to {new_status}.', 'success')
     else:
         flash('Invalid status transition.', 'danger')
@@ -473,6 +481,7 @@ def reply_review(review_id):
     
     review.reply = request.form.get('reply')
     review.reply_at = datetime.utcnow()
+    current_user.bakery.touch()
     db.session.commit()
     
     flash('Reply posted!', 'success')
@@ -1,34 +1,51 @@
 """Cart routes."""
 
+from dataclasses import dataclass, field
 from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
 from flask_login import login_required, current_user
+from sqlalchemy import func
 from app.extensions import db
 from app.models import CartItem, Product, Bakery
+from app.utils.cart import get_cart_items, clear_cart_items
 
 cart_bp = Blueprint('cart', __name__)
 
 
+@dataclass(slots=True)
+class BakeryCartGroup:
+    """Cart items from a single bakery."""
+    bakery: Bakery
+    cart_items: list = field(default_factory=list)
+    subtotal: float = 0
+
+
 @cart_bp.route('/')
 @login_required
 def view_cart():
     """View shopping cart."""
-    cart_items = CartItem.query.filter_by(user_id=current_user.id).all()
+    cart_items = get_cart_items()
+    
+    # Per-bakery subtotals summed in SQL
+    subtotals = dict(db.session.query(
+        Product.bakery_id,
+        func.sum(CartItem.quantity * Product.current_price)
+    ).join(Product, Product.id == CartItem.product_id).filter(
+        CartItem.user_id == current_user.id
+    ).group_by(Product.bakery_id).all())
     
     # Group items by bakery
     bakeries = {}
     for item in cart_items:
         bakery_id = item.product.bakery_id
         if bakery_id not in bakeries:
-            bakeries[bakery_id] = {
-                'bakery': item.product.bakery,
-                'cart_items': [],
-                'subtotal': 0
-            }
-        bakeries[bakery_id]['cart_items'].append(item)
-        bakeries[bakery_id]['subtotal'] += item.subtotal
+            bakeries[bakery_id] = BakeryCartGroup(
+                bakery=item.product.bakery,
+                subtotal=subtotals.get(bakery_id, 0)
+            )
+        bakeries[bakery_id].cart_items.append(item)
     
     # Calculate totals
-    cart_total = sum(b['subtotal'] for b in bakeries.values())
+    cart_total = sum(b.subtotal for b in bakeries.values())
     
     return render_template('customer/cart.html',
                          bakeries=bakeries,
@@ -55,8 +72,8 @@ def add_to_cart():
         return redirect(request.referrer or url_for('main.index'))
     
     # Check for existing cart item from different bakery
-    existing_items = CartItem.query.filter_by(user_id=current_user.id).first()
-    if existing_items and existing_items.product.bakery_id != product.bakery_id:
+    cart_items = get_cart_items()
+    if cart_items and cart_items[0].product.bakery_id != product.bakery_id:
         # Clear cart and add new item (or ask user)
         if not request.form.get('replace_cart'):
             flash('Your cart contains items from a different bakery. Adding this will replace your cart.', 'warning')
@@ -65,12 +82,10 @@ def add_to_cart():
                                  quantity=quantity)
         else:
             CartItem.query.filter_by(user_id=current_user.id).delete()
+            cart_items = []
     
     # Check if already in cart
-    cart_item = CartItem.query.filter_by(
-        user_id=current_user.id,
-        product_id=product_id
-    ).first()
+    cart_item = next((item for item in cart_items if item.product_id == product_id), None)
     
     if cart_item:
         cart_item.quantity += quantity
@@ -85,6 +100,7 @@ def add_to_cart():
         db.session.add(cart_item)
     
     db.session.commit()
+    clear_cart_items()
     flash(f'{product.name} added to cart!', 'success')
     
     # Return JSON for AJAX requests
@@ -115,6 +131,7 @@ def update_cart():
         message = 'Cart updated.'
     
     db.session.commit()
+    clear_cart_items()
     
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         cart_count = CartItem.query.filter_by(user_id=current_user.id).count()
@@ -135,6 +152,7 @@ def remove_from_cart(item_id):
     
     db.session.delete(cart_item)
     db.session.commit()
+    clear_cart_items()
     
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         cart_count = CartItem.query.filter_by(user_id=current_user.id).count()
@@ -150,6 +168,7 @@ def clear_cart():
     """Clear all items from cart."""
     CartItem.query.filter_by(user_id=current_user.id).delete()
     db.session.commit()
+    clear_cart_items()
     
     flash('Cart cleared.', 'success')
     return redirect(url_for('cart.view_cart'))
@@ -19,10 +19,7 @@ def dashboard():
     ).order_by(Order.created_at.desc()).limit(5).all()
     
     # Unread notifications
-    unread_notifications = Notification.query.filter_by(
-        user_id=current_user.id,
-        is_read=False
-    ).count()
+    unread_notifications = Notification.unread_count(current_user.id)
     
     return render_template('customer/dashboard.html',
                          recent_orders=recent_orders,
@@ -126,7 +123,9 @@ def notifications():
         user_id=current_user.id
     ).order_by(Notification.created_at.desc())
     
-    pagination = notifications_query.paginate(page=page, per_page=20, error_out=False)
+    # Skip the COUNT query and use the cached total instead
+    pagination = notifications_query.paginate(page=page, per_page=20, error_out=False, count=False)
+    pagination.total = Notification.total_count(current_user.id)
     
     return render_template('customer/notifications.html',
                          notifications=pagination.items,
@@ -142,6 +141,7 @@ def mark_notifications_read():
         is_read=False
     ).update({'is_read': True})
     db.session.commit()
+    Notification.clear_counts(current_user.id)
     
     return redirect(url_for('customer.notifications'))
 
@@ -204,10 +204,10 @@ def delete_my_review(review_id):
     
     bakery = review.bakery
     db.session.delete(review)
-    db.session.commit()
     
     # Update bakery rating
     bakery.update_rating()
+    db.session.commit()
     
     flash('Review deleted.', 'success')
     return redirect(url_for('customer.my_reviews'))
@@ -1,32 +1,65 @@
 """Main public routes."""
 
 from flask import Blueprint, render_template, request, current_app
-from app.models import Bakery, Product, Category
-from sqlalchemy import or_
+from markupsafe import Markup
+from app.models import Bakery, Product, Category, Review
+from app.utils.cache import cached_fragment
+from sqlalchemy import or_, select, bindparam, lambda_stmt
+from sqlalchemy.orm import joinedload, contains_eager
 
 main_bp = Blueprint('main', __name__)
 
+# Columns rendered by the homepage bakery cards
+BAKERY_CARD_COLUMNS = (
+    Bakery.id, Bakery.name, Bakery.slug, Bakery.description, Bakery.logo_url,
+    Bakery.rating, Bakery.delivery_time_mins, Bakery.city, Bakery.is_open,
+    Bakery.min_order_amount,
+)
+
+# Search statements are built once; the pattern is bound per request
+SEARCH_BAKERIES = lambda_stmt(lambda: select(Bakery).where(
+    Bakery.is_approved == True,
+    or_(
+        Bakery.name.ilike(bindparam('q')),
+        Bakery.description.ilike(bindparam('q')),
+        Bakery.city.ilike(bindparam('q'))
+    )
+).limit(6))
+
+SEARCH_PRODUCTS = lambda_stmt(lambda: select(Product).join(Bakery).where(
+    Bakery.is_approved == True,
+    Product.is_available == True,
+    or_(
+        Product.name.ilike(bindparam('q')),
+        Product.description.ilike(bindparam('q'))
+    )
+).limit(12))
+
 
 @main_bp.route('/')
 def index():
     """Homepage with featured bakeries."""
     # Featured bakeries
-    featured_bakeries = Bakery.query.filter_by(
-        is_approved=True, 
-        is_featured=True
-    ).limit(6).all()
+    featured_bakeries = db.session.execute(
+        select(*BAKERY_CARD_COLUMNS).where(
+            Bakery.is_approved == True,
+            Bakery.is_featured == True
+        ).limit(6)
+    ).all()
     
     # All approved bakeries
-    bakeries = Bakery.query.filter_by(is_approved=True).order_by(
-        Bakery.rating.desc()
-    ).limit(8).all()
+    bakeries = db.session.execute(
+        select(*BAKERY_CARD_COLUMNS).where(
+            Bakery.is_approved == True
+        ).order_by(Bakery.rating.desc()).limit(8)
+    ).all()
     
     # Popular products
     popular_products = Product.query.join(Bakery).filter(
         Bakery.is_approved == True,
         Product.is_available == True,
         Product.is_bestseller == True
-    ).limit(8).all()
+    ).options(contains_eager(Product.bakery)).limit(8).all()
     
     return render_template('main/index.html',
                          featured_bakeries=featured_bakeries,
@@ -93,29 +126,37 @@ def bakery_detail(slug):
     """Individual bakery page with products."""
     bakery = Bakery.query.filter_by(slug=slug, is_approved=True).first_or_404()
     
-    # Get categories with products
-    categories = Category.query.filter_by(
-        bakery_id=bakery.id,
-        is_active=True
-    ).order_by(Category.display_order).all()
-    
-    # Products without category
-    uncategorized_products = Product.query.filter_by(
-        bakery_id=bakery.id,
-        category_id=None,
-        is_available=True
-    ).all()
+    def render_menu():
+        # Get categories
+        categories = Category.query.filter_by(
+            bakery_id=bakery.id,
+            is_active=True
+        ).order_by(Category.display_order).all()
+        
+        # Load all available products at once and group them by category
+        products_by_category = {}
+        for product in Product.query.filter_by(bakery_id=bakery.id, is_available=True):
+            products_by_category.setdefault(product.category_id, []).append(product)
+        
+        # Get reviews
+        reviews = bakery.reviews.filter_by(is_visible=True).options(
+            joinedload(Review.user)
+        ).order_by(db.desc('created_at')).limit(10).all()
+        
+        return render_template('main/_bakery_menu.html',
+                             bakery=bakery,
+                             categories=categories,
+                             products_by_category=products_by_category,
+                             uncategorized_products=products_by_category.get(None, []),
+                             reviews=reviews)
     
-    # Get reviews
-    reviews = bakery.reviews.filter_by(is_visible=True).order_by(
-        db.desc('created_at')
-    ).limit(10).all() if hasattr(bakery, 'reviews') else []
+    # Edits to the bakery stamp updated_at, which rolls the cache key
+    version = bakery.updated_at.timestamp() if bakery.updated_at else 0
+    menu_html = cached_fragment(f'v1:bakery:{slug}:{version}', render_menu)
     
     return render_template('main/bakery_detail.html',
                          bakery=bakery,
-                         categories=categories,
-                         uncategorized_products=uncategorized_products,
-                         reviews=reviews)
+                         menu_html=Markup(menu_html))
 
 
 @main_bp.route('/product/<int:product_id>')
@@ -151,25 +192,13 @@ def search():
                              bakeries=[],
                              products=[])
     
+    params = {'q': f'%{query}%'}
+    
     # Search bakeries
-    bakeries = Bakery.query.filter(
-        Bakery.is_approved == True,
-        or_(
-            Bakery.name.ilike(f'%{query}%'),
-            Bakery.description.ilike(f'%{query}%'),
-            Bakery.city.ilike(f'%{query}%')
-        )
-    ).limit(6).all()
+    bakeries = db.session.execute(SEARCH_BAKERIES, params).scalars().all()
     
     # Search products
-    products = Product.query.join(Bakery).filter(
-        Bakery.is_approved == True,
-        Product.is_available == True,
-        or_(
-            Product.name.ilike(f'%{query}%'),
-            Product.description.ilike(f'%{query}%')
-        )
-    ).limit(12).all()
+    products = db.session.execute(SEARCH_PRODUCTS, params).scalars().all()
     
     return render_template('main/search_results.html',
                          query=query,
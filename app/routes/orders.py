@@ -3,9 +3,13 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_required, current_user
 from datetime import datetime, timedelta
+from sqlalchemy import tuple_
+from sqlalchemy.orm import joinedload
 from app.extensions import db
 from app.models import (Order, OrderItem, OrderStatusHistory, CartItem, 
                         Address, Coupon, Notification, Product)
+from app.utils.cart import get_cart_items, clear_cart_items
+from app.utils.pagination import encode_cursor, decode_cursor
 
 orders_bp = Blueprint('orders', __name__)
 
@@ -14,7 +18,7 @@ orders_bp = Blueprint('orders', __name__)
 @login_required
 def checkout():
     """Checkout page."""
-    cart_items = CartItem.query.filter_by(user_id=current_user.id).all()
+    cart_items = get_cart_items()
     
     if not cart_items:
         flash('Your cart is empty.', 'warning')
@@ -99,6 +103,9 @@ def checkout():
         # Add status history
         order.add_status_history('pending', 'Order placed')
         
+        # Stock changed, refresh the cached bakery page
+        bakery.touch()
+        
         # Clear cart
         CartItem.query.filter_by(user_id=current_user.id).delete()
         
@@ -112,6 +119,8 @@ def checkout():
         db.session.add(notification)
         
         db.session.commit()
+        clear_cart_items()
+        Notification.clear_counts(current_user.id)
         
         flash('Order placed successfully!', 'success')
         return redirect(url_for('orders.order_confirmation', order_number=order.order_number))
@@ -141,17 +150,33 @@ def order_confirmation(order_number):
 @login_required
 def order_history():
     """Order history."""
-    page = request.args.get('page', 1, type=int)
+    per_page = 10
+    cursor = request.args.get('cursor', '')
     
     orders_query = Order.query.filter_by(
         customer_id=current_user.id
-    ).order_by(Order.created_at.desc())
+    ).options(joinedload(Order.bakery))
+    
+    # Seek past the last order of the previous page instead of using OFFSET
+    position = decode_cursor(cursor) if cursor else None
+    if position:
+        orders_query = orders_query.filter(
+            tuple_(Order.created_at, Order.id) < position
+        )
+    
+    orders = orders_query.order_by(
+        Order.created_at.desc(), Order.id.desc()
+    ).limit(per_page + 1).all()
     
-    pagination = orders_query.paginate(page=page, per_page=10, error_out=False)
+    next_cursor = None
+    if len(orders) > per_page:
+        orders = orders[:per_page]
+        next_cursor = encode_cursor(orders[-1].created_at, orders[-1].id)
     
     return render_template('customer/orders.html',
-                         orders=pagination.items,
-                         pagination=pagination)
+                         orders=orders,
+                         cursor=cursor,
+                         next_cursor=next_cursor)
 
 
 @orders_bp.route('/<order_number>')
@@ -216,6 +241,7 @@ def cancel_order(order_number):
     # Restore stock
     for item in order.items:
         item.product.stock_quantity += item.quantity
+    order.bakery.touch()
     
     db.session.commit()
     
@@ -0,0 +1,25 @@
+"""Caching helpers built on the shared cache extension."""
+
+import random
+import time
+from app.extensions import cache
+
+
+def cached_fragment(key, render, timeout=600, early_refresh=0.8):
+    """Return a cached value, rendering and storing it on a miss.
+
+    Entries past ``early_refresh`` of their lifetime are re-rendered by a
+    random subset of readers (growing to all of them at expiry), so a hot
+    key is refreshed before it expires instead of stampeding on the miss.
+    """
+    entry = cache.get(key)
+    now = time.time()
+    if entry is not None:
+        value, stored_at = entry
+        age = (now - stored_at) / timeout
+        if age < early_refresh or random.random() > (age - early_refresh) / (1 - early_refresh):
+            return value
+
+    value = render()
+    cache.set(key, (value, now), timeout=timeout)
+    return value
@@ -0,0 +1,20 @@
+"""Request-scoped cart helpers."""
+
+from flask import g
+from flask_login import current_user
+from sqlalchemy.orm import joinedload
+from app.models import CartItem, Product
+
+
+def get_cart_items():
+    """Get the current user's cart items, loaded once per request."""
+    if 'cart_items' not in g:
+        g.cart_items = CartItem.query.filter_by(user_id=current_user.id).options(
+            joinedload(CartItem.product).joinedload(Product.bakery)
+        ).all()
+    return g.cart_items
+
+
+def clear_cart_items():
+    """Forget the loaded cart items after the cart has been changed."""
+    g.pop('cart_items', None)
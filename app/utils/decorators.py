@@ -1,60 +1,118 @@
 """Role-based access decorators."""
 
-from functools import wraps
-from flask import redirect, url_for, flash, abort
+from flask import redirect, url_for, flash, abort, g, current_app, request
 from flask_login import current_user
+from app.models import User
+
+CUSTOMER_MASK = User.FLAG_AUTH | User.FLAG_CUSTOMER
+BAKER_MASK = User.FLAG_AUTH | User.FLAG_BAKER
+BAKER_APPROVED_MASK = BAKER_MASK | User.FLAG_BAKERY_APPROVED
+ADMIN_MASK = User.FLAG_AUTH | User.FLAG_ADMIN
+
+
+def _cached(attr, fn):
+    """Evaluate a role predicate once per request for the current user."""
+    role_cache = g.setdefault('_role_cache', {})
+    key = (current_user.get_id(), attr)
+    if key not in role_cache:
+        role_cache[key] = fn()
+    return role_cache[key]
+
+
+def _get_flags():
+    """Get the current user's role flags, or 0 when not logged in."""
+    if not current_user.is_authenticated:
+        return 0
+    return _cached('flags', lambda: current_user.role_flags)
+
+
+def _cached_url(endpoint):
+    """Resolve a fixed endpoint once per app; the URL map does not change."""
+    urls = current_app.extensions.setdefault('_role_urls', {})
+    if endpoint not in urls:
+        urls[endpoint] = url_for(endpoint)
+    return urls[endpoint]
+
+
+def _login_url():
+    """Login page URL."""
+    return _cached_url('auth.login')
+
+
+def _index_url():
+    """Homepage URL."""
+    return _cached_url('main.index')
+
+
+def _pending_url():
+    """Bakery pending approval page URL."""
+    return _cached_url('baker.pending_approval')
+
+
+def _wants_json():
+    """Check if the request comes from a script that never renders flashes."""
+    return (request.is_json
+            or request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+            or request.accept_mimetypes.best == 'application/json')
+
+
+class _RoleGate:
+    """View wrapper that checks the current user's role flags before calling it."""
+    # Only the wrapper attributes Flask and inspect.unwrap read are copied; a __dict__
+    # for update_wrapper would defeat the slots (__doc__/__module__ stay the class's)
+    __slots__ = ('f', 'masks', 'denied_msg', 'pending_check', 'abort_denied',
+                 '__name__', '__qualname__', '__wrapped__')
+    
+    def __init__(self, f, mask, denied_msg, admin_bypass=True, pending_check=False, abort_denied=False):
+        self.f = f
+        # (required, bypass): the view runs if either mask is fully set.
+        # Admins pass every gate except the baker ones, whose views need a bakery
+        self.masks = (mask, ADMIN_MASK if admin_bypass else mask)
+        self.denied_msg = denied_msg
+        self.pending_check = pending_check
+        self.abort_denied = abort_denied
+        self.__name__ = f.__name__
+        self.__qualname__ = f.__qualname__
+        self.__wrapped__ = f
+    
+    def __call__(self, *args, **kwargs):
+        flags = _get_flags()
+        required, bypass = self.masks
+        if flags & bypass == bypass or flags & required == required:
+            return self.f(*args, **kwargs)
+        
+        if not flags & User.FLAG_AUTH:
+            return redirect(_login_url())
+        # Skip the session write of flash() for API callers
+        if _wants_json():
+            abort(403)
+        if self.pending_check and flags & BAKER_MASK == BAKER_MASK:
+            flash('Your bakery is pending approval.', 'warning')
+            return redirect(_pending_url())
+        flash(self.denied_msg, 'danger')
+        if self.abort_denied:
+            abort(403)
+        return redirect(_index_url())
 
 
 def customer_required(f):
     """Decorator to require customer role."""
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated:
-            return redirect(url_for('auth.login'))
-        if not current_user.is_customer() and not current_user.is_admin():
-            flash('Access denied.', 'danger')
-            return redirect(url_for('main.index'))
-        return f(*args, **kwargs)
-    return decorated_function
+    return _RoleGate(f, CUSTOMER_MASK, 'Access denied.')
 
 
 def baker_required(f):
     """Decorator to require baker role with approved bakery."""
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated:
-            return redirect(url_for('auth.login'))
-        if not current_user.is_baker():
-            flash('Access denied. Baker account required.', 'danger')
-            return redirect(url_for('main.index'))
-        if not current_user.bakery or not current_user.bakery.is_approved:
-            flash('Your bakery is pending approval.', 'warning')
-            return redirect(url_for('baker.pending_approval'))
-        return f(*args, **kwargs)
-    return decorated_function
+    return _RoleGate(f, BAKER_APPROVED_MASK, 'Access denied. Baker account required.',
+                     admin_bypass=False, pending_check=True)
 
 
 def baker_or_pending_required(f):
     """Decorator for baker routes that work even when pending approval."""
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated:
-            return redirect(url_for('auth.login'))
-        if not current_user.is_baker():
-            flash('Access denied. Baker account required.', 'danger')
-            return redirect(url_for('main.index'))
-        return f(*args, **kwargs)
-    return decorated_function
+    return _RoleGate(f, BAKER_MASK, 'Access denied. Baker account required.',
+                     admin_bypass=False)
 
 
 def admin_required(f):
     """Decorator to require admin role."""
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated:
-            return redirect(url_for('auth.login'))
-        if not current_user.is_admin():
-            flash('Access denied. Admin privileges required.', 'danger')
-            abort(403)
-        return f(*args, **kwargs)
-    return decorated_function
+    return _RoleGate(f, ADMIN_MASK, 'Access denied. Admin privileges required.',
+                     abort_denied=True)
@@ -0,0 +1,20 @@
+"""Keyset (seek) pagination helpers."""
+
+import base64
+from datetime import datetime
+
+
+def encode_cursor(created_at, row_id):
+    """Encode the position of the last row on a page as an opaque cursor."""
+    raw = f'{created_at.isoformat()}|{row_id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Decode a cursor into a (created_at, id) tuple, or None if invalid."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, row_id = raw.split('|')
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeError):
+        return None
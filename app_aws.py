@@ -2,46 +2,170 @@
 # Uses DynamoDB for data storage and SNS for notifications
 # Deploy this file on EC2 with appropriate IAM role
 
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
+from flask import Flask, render_template, stream_template, request, redirect, url_for, session, flash, jsonify, g, get_flashed_messages
 import os
+import re
 import uuid
+import time
+import threading
+import tempfile
+import json
+import math
+import base64
+import heapq
 import boto3
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import wraps
+from jinja2 import FileSystemBytecodeCache
 from werkzeug.utils import secure_filename
 from werkzeug.security import generate_password_hash, check_password_hash
 from boto3.dynamodb.conditions import Key, Attr
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from decimal import Decimal
 
 app = Flask(__name__, template_folder='app/templates', static_folder='app/static')
 app.secret_key = os.environ.get('SECRET_KEY', 'production-secret-key-change-this')
 
+# Keep compiled templates in memory and on disk so workers skip recompiling them
+JINJA_CACHE_DIR = os.environ.get('JINJA_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'freshbakes_jinja'))
+os.makedirs(JINJA_CACHE_DIR, exist_ok=True)
+app.jinja_options = dict(app.jinja_options, cache_size=400, bytecode_cache=FileSystemBytecodeCache(JINJA_CACHE_DIR))
+
 # ==================== AWS CONFIGURATION ====================
 
 # AWS Region - Update this to your region
 REGION = os.environ.get('AWS_REGION', 'us-east-1')
 
-# Initialize AWS clients
-dynamodb = boto3.resource('dynamodb', region_name=REGION)
-sns = boto3.client('sns', region_name=REGION)
+# Shared client settings: the connection pool must cover EXECUTOR's concurrent reads
+# plus the per-call parallel_scan pools (up to 8 segments each) they can start
+AWS_CONFIG = Config(
+    region_name=REGION,
+    max_pool_connections=100,
+    retries={'mode': 'adaptive', 'max_attempts': 5},
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=5
+)
+
+# Initialize AWS clients (one of each, reused across requests)
+dynamodb = boto3.resource('dynamodb', config=AWS_CONFIG)
+sns = boto3.client('sns', config=AWS_CONFIG)
+
+# Low-level client for whole-table aggregate scans: items stay in wire format ({'S': ...},
+# {'N': ...}), so rows that are only counted or summed skip Decimal/TypeDeserializer work
+dynamodb_client = boto3.client('dynamodb', config=AWS_CONFIG)
+DESERIALIZER = TypeDeserializer()
+
+# Optional DAX cluster in front of the read-mostly tables (set DAX_ENDPOINT to enable;
+# amazon-dax-client is in requirements-aws-extras.txt).
+# DAX is write-through, so writes to these tables also go through it to keep it coherent.
+DAX_ENDPOINT = os.environ.get('DAX_ENDPOINT')
+if DAX_ENDPOINT:
+    from amazondax import AmazonDaxClient
+    read_cache = AmazonDaxClient.resource(endpoint_url=DAX_ENDPOINT, region_name=REGION)
+else:
+    read_cache = dynamodb
+
+# Optional OpenSearch index for bakery/product search (set OPENSEARCH_ENDPOINT to enable;
+# opensearch-py is in requirements-aws-extras.txt).
+# Documents are kept in sync from DynamoDB Streams by a separate indexing Lambda:
+#   bakeries: {bakery_id, name, city, description, is_approved}
+#   products: {product_id, name, description, bakery_id, is_available}
+OPENSEARCH_ENDPOINT = os.environ.get('OPENSEARCH_ENDPOINT')
+if OPENSEARCH_ENDPOINT:
+    from opensearchpy import OpenSearch, OpenSearchException, RequestsHttpConnection, AWSV4SignerAuth
+    search_client = OpenSearch(
+        hosts=[{'host': OPENSEARCH_ENDPOINT, 'port': 443}],
+        http_auth=AWSV4SignerAuth(boto3.Session().get_credentials(), REGION, 'es'),
+        use_ssl=True,
+        verify_certs=True,
+        connection_class=RequestsHttpConnection
+    )
+else:
+    search_client = None
+
+# Optional S3 bucket for uploaded images (set S3_BUCKET to enable). Objects use the same
+# images/... keys as app/static, so serve the bucket at /static/images (e.g. a CloudFront
+# behaviour) and the templates' image URLs keep working.
+S3_BUCKET = os.environ.get('S3_BUCKET')
+s3 = boto3.client('s3', config=AWS_CONFIG) if S3_BUCKET else None
 
 # DynamoDB Tables (Create these in AWS Console first)
+# Global secondary indexes used by query_index() (partition key = attribute name):
+#   FreshBakes_Bakeries:   slug-index, owner_email-index,
+#                          pending-index (sparse: only unapproved bakeries carry `pending`;
+#                          run `flask --app app_aws backfill-pending` once for older rows)
+#   FreshBakes_Categories: bakery_id-index
+#   FreshBakes_Products:   bakery_id-index
+#   FreshBakes_Reviews:    bakery_id-index
+#   FreshBakes_Users:      role-index
+#   FreshBakes_Orders:     customer_email-created_at-index, bakery_id-created_at-index,
+#                          status-created_at-index
+#                          (sort key created_at, so orders come back newest first)
+#   FreshBakes_Addresses:  user_email-index (sort key address_id: ULIDs, so oldest first)
 users_table = dynamodb.Table('FreshBakes_Users')
 addresses_table = dynamodb.Table('FreshBakes_Addresses')
-bakeries_table = dynamodb.Table('FreshBakes_Bakeries')
-categories_table = dynamodb.Table('FreshBakes_Categories')
-products_table = dynamodb.Table('FreshBakes_Products')
+bakeries_table = read_cache.Table('FreshBakes_Bakeries')
+categories_table = read_cache.Table('FreshBakes_Categories')
+products_table = read_cache.Table('FreshBakes_Products')
 cart_items_table = dynamodb.Table('FreshBakes_CartItems')
 orders_table = dynamodb.Table('FreshBakes_Orders')
 order_items_table = dynamodb.Table('FreshBakes_OrderItems')
 reviews_table = dynamodb.Table('FreshBakes_Reviews')
 
+# Shared pool for running independent table reads concurrently (boto3 clients are thread-safe)
+EXECUTOR = ThreadPoolExecutor(max_workers=16)
+
+# DynamoDB caps a single TransactWriteItems request at 100 actions
+TRANSACT_MAX_ITEMS = 100
+
+class TTLCache:
+    """Small thread-safe dict whose entries expire after ttl seconds."""
+    MISSING = object()
+    
+    def __init__(self, ttl, maxsize=10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=MISSING):
+        with self._lock:
+            entry = self._data.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return default
+        return entry[1]
+    
+    def set(self, key, value):
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                self._data.pop(next(iter(self._data)))
+            self._data[key] = (time.monotonic() + self.ttl, value)
+    
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+# Per-process caches for rarely changing rows; other workers catch up within the TTL
+bakery_cache = TTLCache(ttl=30)         # owner_email -> bakery item (or None); short, as it carries
+                                        # is_approved/is_open, which other workers may change
+categories_cache = TTLCache(ttl=600)    # bakery_id -> category items (baker form pages only)
+segments_cache = TTLCache(ttl=3600)     # table name -> parallel scan segment count
+
 # SNS Topic ARN - Replace with your actual SNS Topic ARN
 SNS_TOPIC_ARN = os.environ.get('SNS_TOPIC_ARN', 'arn:aws:sns:us-east-1:307946664606:FreshBakes')
 
+# Password hashing: scrypt runs in OpenSSL rather than a PBKDF2 iteration loop
+PASSWORD_HASH_METHOD = 'scrypt:32768:8:1'
+
 # Configuration for File Uploads
 UPLOAD_FOLDER = 'app/static/images'
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max upload, as in config.py
 
 # Ensure upload directories exist
 for sub_dir in ['bakeries', 'products', 'profiles']:
@@ -50,7 +174,11 @@ for sub_dir in ['bakeries', 'products', 'profiles']:
 # ==================== HELPER FUNCTIONS ====================
 
 def send_notification(subject, message):
-    """Send SNS notification."""
+    """Send SNS notification in the background; the result is never used."""
+    EXECUTOR.submit(_publish_notification, subject, message)
+
+def _publish_notification(subject, message):
+    """Publish a notification to the SNS topic."""
     try:
         sns.publish(
             TopicArn=SNS_TOPIC_ARN,
@@ -60,6 +188,329 @@ def send_notification(subject, message):
     except ClientError as e:
         print(f"Error sending notification: {e}")
 
+# Attributes read by the list templates; fetch only these for card/list views
+BAKERY_CARD_FIELDS = ('bakery_id', 'name', 'slug', 'description', 'logo_url', 'rating',
+                      'delivery_time_mins', 'city', 'is_open', 'min_order_amount', 'is_featured')
+PRODUCT_CARD_FIELDS = ('product_id', 'bakery_id', 'name', 'image_url', 'price', 'discount_price',
+                       'is_vegetarian')
+ORDER_LIST_FIELDS = ('order_number', 'bakery_id', 'status', 'created_at', 'total_amount', 'items')
+BAKER_ORDER_FIELDS = ORDER_LIST_FIELDS + ('customer_email',)
+ORDER_STATS_FIELDS = ('order_number', 'customer_email', 'status', 'created_at', 'total_amount')
+USER_STATS_FIELDS = ('email', 'role', 'is_active')
+BAKERY_ADMIN_FIELDS = ('bakery_id', 'name', 'city', 'created_at', 'is_approved')
+ORDER_ADMIN_FIELDS = ('order_number', 'customer_email', 'bakery_id', 'total_amount', 'status', 'created_at')
+USER_ADMIN_FIELDS = ('email', 'name', 'phone', 'role', 'created_at', 'is_active')
+ADDRESS_FIELDS = ('address_id', 'label', 'full_address', 'city', 'pincode', 'landmark', 'is_default')
+# Admin table rows: Jinja reads tuple attributes directly instead of failing getattr
+# on a dict and falling back to a key lookup for every cell
+OrderRow = namedtuple('OrderRow', ORDER_ADMIN_FIELDS)
+UserRow = namedtuple('UserRow', USER_ADMIN_FIELDS)
+
+# Sparse-index marker written on unapproved bakeries and removed on approval
+PENDING = 'PENDING'
+
+# Filters shared by the listing reads, built once
+APPROVED_FILTER = Attr('is_approved').eq(True)
+FEATURED_FILTER = APPROVED_FILTER & Attr('is_featured').eq(True)
+AVAILABLE_FILTER = Attr('is_available').eq(True)
+BESTSELLER_FILTER = Attr('is_bestseller').eq(True) & AVAILABLE_FILTER
+
+def projection(*fields):
+    """Build ProjectionExpression kwargs, aliasing every name to dodge reserved words."""
+    names = {f'#p{i}': field for i, field in enumerate(fields)}
+    return {'ProjectionExpression': ', '.join(names), 'ExpressionAttributeNames': names}
+
+def query_index(table, index_name, key_condition, **kwargs):
+    """Query a secondary index and return all matching items across pages."""
+    response = table.query(IndexName=index_name, KeyConditionExpression=key_condition, **kwargs)
+    items = response.get('Items', [])
+    while 'LastEvaluatedKey' in response:
+        response = table.query(IndexName=index_name, KeyConditionExpression=key_condition,
+                               ExclusiveStartKey=response['LastEvaluatedKey'], **kwargs)
+        items.extend(response.get('Items', []))
+    return items
+
+def get_bakery_for_user(user_email, bakery_id=None):
+    """Return the bakery owned by user_email, or None.
+    
+    A known bakery_id (kept in the session at login) turns a cache miss into a point read.
+    """
+    bakery = bakery_cache.get(user_email)
+    if bakery is not TTLCache.MISSING:
+        return dict(bakery) if bakery else None
+    
+    if bakery_id:
+        bakery = bakeries_table.get_item(Key={'bakery_id': bakery_id}).get('Item')
+        if bakery and bakery.get('owner_email') != user_email:
+            bakery = None
+    else:
+        response = bakeries_table.query(
+            IndexName='owner_email-index',
+            KeyConditionExpression=Key('owner_email').eq(user_email),
+            Limit=1
+        )
+        items = response.get('Items', [])
+        bakery = items[0] if items else None
+    bakery_cache.set(user_email, bakery)
+    return dict(bakery) if bakery else None
+
+def forget_bakery(user_email):
+    """Drop a cached owner_email -> bakery entry after the bakery changes."""
+    bakery_cache.pop(user_email)
+
+def get_categories(bakery_id):
+    """Return a bakery's categories, cached until a category is written."""
+    categories = categories_cache.get(bakery_id)
+    if categories is TTLCache.MISSING:
+        categories = query_index(categories_table, 'bakery_id-index', Key('bakery_id').eq(bakery_id))
+        categories_cache.set(bakery_id, categories)
+    return list(categories)
+
+def current_bakery():
+    """The logged-in baker's bakery, looked up at most once per request."""
+    if 'bakery' not in g:
+        g.bakery = get_bakery_for_user(session['user_email'], session.get('bakery_id'))
+    return g.bakery
+
+def batch_get(table, key_name, ids):
+    """Batch-read items by their hash key and return them keyed by it."""
+    keys = [{key_name: item_id} for item_id in dict.fromkeys(ids)]
+    found = {}
+    # BatchGetItem accepts at most 100 keys per request
+    for start in range(0, len(keys), 100):
+        request_items = {table.name: {'Keys': keys[start:start + 100]}}
+        delay = 0.05
+        while request_items:
+            response = read_cache.batch_get_item(RequestItems=request_items)
+            for item in response['Responses'].get(table.name, []):
+                found[item[key_name]] = item
+            request_items = response.get('UnprocessedKeys')
+            if request_items:
+                time.sleep(delay)
+                delay = min(delay * 2, 1.6)
+    return found
+
+def fetch_products(product_ids):
+    """Batch-read products by id and return them keyed by product_id."""
+    return batch_get(products_table, 'product_id', product_ids)
+
+def search_index(query):
+    """Rank bakeries and products for a search query in OpenSearch.
+    
+    Returns (bakeries, products) read back from DynamoDB in rank order, or
+    None if the search cluster could not be reached.
+    """
+    def ranked_ids(index, id_field, flag, size):
+        body = {
+            'query': {'bool': {
+                'must': {'multi_match': {
+                    'query': query,
+                    'fields': ['name^3', 'city', 'description'],
+                    'fuzziness': 'AUTO'
+                }},
+                'filter': {'term': {flag: True}}
+            }},
+            '_source': [id_field],
+            'size': size
+        }
+        hits = search_client.search(index=index, body=body)['hits']['hits']
+        return [hit['_source'][id_field] for hit in hits]
+    
+    try:
+        bakery_ids = ranked_ids('bakeries', 'bakery_id', 'is_approved', 6)
+        product_ids = ranked_ids('products', 'product_id', 'is_available', 12)
+    except OpenSearchException as e:
+        print(f"Search index error: {e}")
+        return None
+    
+    bakeries = batch_get(bakeries_table, 'bakery_id', bakery_ids)
+    products = fetch_products(product_ids)
+    return ([bakeries[i] for i in bakery_ids if i in bakeries],
+            [products[i] for i in product_ids if i in products])
+
+def read_first(read, count, page_size=100, **kwargs):
+    """Page through a table's scan or query method until count items match."""
+    items = []
+    while True:
+        response = read(Limit=page_size, **kwargs)
+        items.extend(response.get('Items', []))
+        if len(items) >= count or 'LastEvaluatedKey' not in response:
+            return items[:count]
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+CROCKFORD_BASE32 = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+
+def new_ulid():
+    """26-character ULID: a millisecond timestamp then 80 random bits, so ids sort by creation time."""
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    return ''.join(CROCKFORD_BASE32[(value >> shift) & 31] for shift in range(125, -1, -5))
+
+def condition_failed(error):
+    """True when a ClientError comes from a failed ConditionExpression."""
+    return error.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException'
+
+THROTTLE_CODES = {'ProvisionedThroughputExceededException', 'ThrottlingException', 'RequestLimitExceeded'}
+
+def throttled(error):
+    """True when a ClientError is DynamoDB throttling that outlasted the client's retries."""
+    return error.response.get('Error', {}).get('Code') in THROTTLE_CODES
+
+def report_read_error(label, error):
+    """Tell the admin a listing is incomplete: throttling gets a retry hint, anything else is logged."""
+    if throttled(error):
+        flash('The system is busy and some data could not be loaded. Please retry shortly.', 'warning')
+    else:
+        print(f"{label} error: {error}")
+        flash('Error loading data.', 'danger')
+
+def count_items(read, **kwargs):
+    """Count matching items server-side with Select='COUNT', paging through a scan or query."""
+    total = 0
+    while True:
+        response = read(Select='COUNT', **kwargs)
+        total += response.get('Count', 0)
+        if 'LastEvaluatedKey' not in response:
+            return total
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def encode_cursor(last_key):
+    """Encode a LastEvaluatedKey as an opaque URL-safe cursor."""
+    return base64.urlsafe_b64encode(json.dumps(last_key).encode()).decode()
+
+def decode_cursor(cursor):
+    """Decode a cursor back into an ExclusiveStartKey, or None if it is malformed."""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, UnicodeError):
+        return None
+    return key if isinstance(key, dict) else None
+
+def read_page(read, cursor=None, limit=50, **kwargs):
+    """Read one page with a table's query or scan method, returning (items, next_cursor)."""
+    start_key = decode_cursor(cursor) if cursor else None
+    if start_key:
+        kwargs['ExclusiveStartKey'] = start_key
+    response = read(Limit=limit, **kwargs)
+    next_cursor = encode_cursor(response['LastEvaluatedKey']) if 'LastEvaluatedKey' in response else None
+    return response.get('Items', []), next_cursor
+
+def as_rows(row_type, items):
+    """Convert projected items to row tuples; missing attributes become None."""
+    return [row_type._make(map(item.get, row_type._fields)) for item in items]
+
+# parallel_scan pools are sized for at most this many segments (see AWS_CONFIG)
+MAX_SCAN_SEGMENTS = 8
+
+def scan_segments(table_name):
+    """Parallel scan segments for a table: about one per MB of data, capped at MAX_SCAN_SEGMENTS."""
+    segments = segments_cache.get(table_name)
+    if segments is TTLCache.MISSING:
+        try:
+            # DescribeTable's size is refreshed roughly every six hours, which is plenty here
+            size = dynamodb_client.describe_table(TableName=table_name)['Table']['TableSizeBytes']
+            segments = min(MAX_SCAN_SEGMENTS, max(1, math.ceil(size / 2**20)))
+        except ClientError as e:
+            print(f"Describe table error: {e}")
+            segments = MAX_SCAN_SEGMENTS
+        segments_cache.set(table_name, segments)
+    return segments
+
+def parallel_scan(scan, total_segments=MAX_SCAN_SEGMENTS, **kwargs):
+    """Scan a whole table as parallel segments with a table's or client's scan method and return all items."""
+    def scan_segment(segment):
+        items = []
+        scan_kwargs = dict(kwargs, Segment=segment, TotalSegments=total_segments)
+        while True:
+            response = scan(**scan_kwargs)
+            items.extend(response.get('Items', []))
+            if 'LastEvaluatedKey' not in response:
+                return items
+            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
+    # A private pool, so callers already running on EXECUTOR cannot starve it
+    with ThreadPoolExecutor(max_workers=total_segments) as pool:
+        return [item for items in pool.map(scan_segment, range(total_segments)) for item in items]
+
+class LazyResult:
+    """List- or dict-like view of a Future (optionally transformed) that only blocks when a template first reads it."""
+    __slots__ = ('_future', '_transform', '_items')
+    
+    def __init__(self, future, transform=None):
+        self._future = future
+        self._transform = transform
+        self._items = None
+    
+    def _resolve(self):
+        if self._items is None:
+            try:
+                items = self._future.result()
+            except ClientError as e:
+                print(f"Deferred read error: {e}")
+                items = []
+            self._items = self._transform(items) if self._transform else items
+        return self._items
+    
+    def __iter__(self):
+        return iter(self._resolve())
+    
+    def __len__(self):
+        return len(self._resolve())
+    
+    def __bool__(self):
+        return bool(self._resolve())
+    
+    def __getitem__(self, index):
+        return self._resolve()[index]
+    
+    def get(self, key, default=None):
+        return self._resolve().get(key, default)
+
+def menu_categories(categories):
+    """Copy categories with the `id` alias _bakery_menu.html keys sections by."""
+    return [dict(c, id=c['category_id']) for c in categories]
+
+def menu_product(product):
+    """Copy a product with the numeric prices, `current_price` and `id` the menu template reads."""
+    price = float(product.get('price') or 0)
+    discount = float(product['discount_price']) if product.get('discount_price') else None
+    return dict(product, id=product['product_id'], price=price, discount_price=discount,
+                current_price=discount if discount is not None else price,
+                stock_quantity=int(product.get('stock_quantity', 0)))
+
+def products_by_category(products):
+    """Group menu products by category_id; uncategorized ones land under None."""
+    grouped = {}
+    for product in products:
+        grouped.setdefault(product.get('category_id') or None, []).append(menu_product(product))
+    return grouped
+
+def uncategorized_products(products):
+    """Menu products with no category_id, shown under "Other Items"."""
+    return [menu_product(p) for p in products if not p.get('category_id')]
+
+def menu_bakery(bakery):
+    """Copy a bakery with the numeric header fields bakery_detail.html formats."""
+    return dict(bakery, rating=float(bakery.get('rating') or 0),
+                total_reviews=int(bakery.get('total_reviews') or 0),
+                min_order_amount=float(bakery.get('min_order_amount') or 0),
+                delivery_fee=float(bakery.get('delivery_fee') or 0))
+
+def menu_review(review):
+    """Copy a review with the `user`, numeric `rating` and datetime `created_at` the menu template reads."""
+    email = review.get('customer_email') or ''
+    try:
+        created_at = datetime.fromisoformat(review.get('created_at') or '').replace(tzinfo=None)
+    except (TypeError, ValueError):
+        created_at = None
+    return dict(review, user={'name': review.get('customer_name') or email.split('@')[0] or 'Customer'},
+                rating=int(review.get('rating') or 0), created_at=created_at)
+
+def menu_reviews(reviews):
+    """The 10 newest visible reviews, as the SQL bakery page shows them."""
+    reviews = [menu_review(r) for r in reviews if r.get('is_visible', True)]
+    reviews.sort(key=lambda r: r['created_at'] or datetime.min, reverse=True)
+    return reviews[:10]
+
 @app.template_filter('format_decimal')
 def format_decimal_filter(value, decimals=2):
     """Format Decimal/float for display in templates."""
@@ -90,28 +541,152 @@ def format_date_filter(value, format='%b %d, %Y'):
             return value
     return value.strftime(format)
 
+# Anything that is not a letter, digit or hyphen (\w also matches "_", so drop it too)
+_SLUG_STRIP = re.compile(r'[^\w-]+|_+')
+
+def store_upload(file, sub_dir, filename):
+    """Store an uploaded image and return its path relative to images/."""
+    relative_path = f"{sub_dir}/{filename}"
+    if s3:
+        # upload_fileobj streams the request body to S3 in multipart chunks, no temp file
+        s3.upload_fileobj(file.stream, S3_BUCKET, f"images/{relative_path}",
+                          ExtraArgs={'ContentType': file.mimetype})
+    else:
+        file.save(os.path.join(UPLOAD_FOLDER, sub_dir, filename))
+    return relative_path
+
 def generate_slug(name):
     """Generate a URL-friendly slug from name."""
-    slug = name.lower().replace(' ', '-')
-    slug = ''.join(c for c in slug if c.isalnum() or c == '-')
-    return slug
+    return _SLUG_STRIP.sub('', name.lower().replace(' ', '-'))
+
+@app.before_request
+def load_current_user():
+    """Read the logged-in user once per request for the helpers below."""
+    g.user_email = session.get('user_email')
+    g.user = None
+    if g.user_email and request.endpoint != 'static':
+        try:
+            g.user = users_table.get_item(Key={'email': g.user_email}).get('Item')
+        except ClientError as e:
+            print(f"Load user error: {e}")
 
 def is_logged_in():
-    return 'user_email' in session
+    return g.get('user_email') is not None
 
 def get_current_user():
-    if not is_logged_in():
-        return None
-    email = session['user_email']
+    return g.get('user')
+
+def get_cart_count():
+    """Total quantity in the current user's cart, kept as a counter on the user item."""
+    user = get_current_user()
+    if not user:
+        return 0
+    if 'cart_count' not in user:
+        # Accounts created before the counter existed: count once and seed it
+        user['cart_count'] = seed_cart_count(user['email'])
+    return max(int(user['cart_count']), 0)
+
+def seed_cart_count(user_email):
+    """Count the user's cart rows into a missing counter; returns the stored value."""
+    response = cart_items_table.query(
+        KeyConditionExpression=Key('user_email').eq(user_email),
+        **projection('quantity')
+    )
+    count = int(sum(item.get('quantity', 0) for item in response.get('Items', [])))
+    # A request that seeded first wins; its value comes back either way
+    response = users_table.update_item(
+        Key={'email': user_email},
+        UpdateExpression='SET cart_count = if_not_exists(cart_count, :c)',
+        ExpressionAttributeValues={':c': count},
+        ReturnValues='UPDATED_NEW'
+    )
+    return int(response['Attributes']['cart_count'])
+
+def adjust_cart_count(user_email, delta):
+    """Atomically add delta to the user's cart counter, seeding it first if it is missing."""
+    if not delta:
+        return
     try:
-        response = users_table.get_item(Key={'email': email})
-        return response.get('Item')
-    except ClientError:
-        return None
+        # ADD on a missing attribute would start from 0 and ignore the rows already in the cart
+        users_table.update_item(
+            Key={'email': user_email},
+            UpdateExpression='ADD cart_count :d',
+            ConditionExpression='attribute_exists(cart_count)',
+            ExpressionAttributeValues={':d': delta}
+        )
+    except ClientError as e:
+        if not condition_failed(e):
+            raise
+        # The cart rows already include this change, so the recount replaces the delta
+        seed_cart_count(user_email)
+
+def reset_cart_count(user_email):
+    """Zero the user's cart counter after the cart is emptied."""
+    users_table.update_item(
+        Key={'email': user_email},
+        UpdateExpression='SET cart_count = :z',
+        ExpressionAttributeValues={':z': 0}
+    )
+
+def order_stats_update(bakery_id, amount, created_at):
+    """UpdateItem arguments that add one order to the running stats kept on its bakery."""
+    month = created_at[:7].replace('-', '_')
+    return {
+        'Key': {'bakery_id': bakery_id},
+        'UpdateExpression': 'ADD total_orders :one, total_revenue :amt, #mo :one, #mr :amt',
+        'ExpressionAttributeNames': {'#mo': f'orders_{month}', '#mr': f'revenue_{month}'},
+        'ExpressionAttributeValues': {':one': 1, ':amt': amount}
+    }
+
+def count_bakery_stats(bakery_id):
+    """Compute a bakery's order stats from its orders."""
+    totals = {'total_orders': 0, 'total_revenue': Decimal(0)}
+    orders = query_index(orders_table, 'bakery_id-created_at-index', Key('bakery_id').eq(bakery_id),
+                         **projection('created_at', 'total_amount'))
+    for o in orders:
+        amount = Decimal(str(o.get('total_amount', 0)))
+        month = o['created_at'][:7].replace('-', '_')
+        totals['total_orders'] += 1
+        totals['total_revenue'] += amount
+        totals[f'orders_{month}'] = totals.get(f'orders_{month}', 0) + 1
+        totals[f'revenue_{month}'] = totals.get(f'revenue_{month}', Decimal(0)) + amount
+    return totals
+
+def write_bakery_stats(bakery_id, totals, condition):
+    """Overwrite a bakery's running stats with computed totals and mark them seeded."""
+    names = {f'#s{i}': name for i, name in enumerate(totals)}
+    values = {f':s{i}': value for i, value in enumerate(totals.values())}
+    bakeries_table.update_item(
+        Key={'bakery_id': bakery_id},
+        UpdateExpression='SET stats_seeded = :t, ' + ', '.join(f'#s{i} = :s{i}' for i in range(len(totals))),
+        ConditionExpression=condition,
+        ExpressionAttributeNames=names,
+        ExpressionAttributeValues={**values, ':t': True}
+    )
+
+def get_bakery_stats(bakery_id):
+    """Read a bakery's running order stats, computing them from its orders the first time.
+    
+    Bakeries created before the counters existed are seeded once; an order placed while the
+    seed is being computed can be missed, so `flask --app app_aws reconcile-stats` should be
+    run periodically to recount them.
+    """
+    stats = bakeries_table.get_item(Key={'bakery_id': bakery_id}, ConsistentRead=True).get('Item', {})
+    if stats.get('stats_seeded'):
+        return stats
+    
+    totals = count_bakery_stats(bakery_id)
+    try:
+        write_bakery_stats(bakery_id, totals, 'attribute_not_exists(stats_seeded)')
+    except ClientError as e:
+        if not condition_failed(e):
+            raise
+        # Another request seeded it first; read theirs
+        return bakeries_table.get_item(Key={'bakery_id': bakery_id}, ConsistentRead=True).get('Item', {})
+    return totals
 
 def login_required(f):
     """Decorator to require login."""
-    from functools import wraps
     @wraps(f)
     def decorated_function(*args, **kwargs):
         if not is_logged_in():
@@ -120,42 +695,33 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
-def baker_required(f):
-    """Decorator to require baker role."""
-    from functools import wraps
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        user = get_current_user()
-        if not user or user.get('role') != 'baker':
-            flash('Access denied.', 'danger')
-            return redirect(url_for('index'))
-        return f(*args, **kwargs)
-    return decorated_function
-
-def admin_required(f):
-    """Decorator to require admin role."""
-    from functools import wraps
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        user = get_current_user()
-        if not user or user.get('role') != 'admin':
-            flash('Access denied.', 'danger')
-            return redirect(url_for('index'))
-        return f(*args, **kwargs)
-    return decorated_function
+def role_required(role):
+    """Decorator to require a logged-in user with the given role (implies login_required)."""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not is_logged_in():
+                flash('Please log in to access this page.', 'info')
+                return redirect(url_for('login'))
+            user = get_current_user()
+            if not user or user.get('role') != role:
+                flash('Access denied.', 'danger')
+                return redirect(url_for('index'))
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+baker_required = role_required('baker')
+admin_required = role_required('admin')
 
 # Context processor for cart count
 @app.context_processor
 def inject_globals():
     cart_count = 0
-    current_user = None
-    if is_logged_in():
-        current_user = get_current_user()
+    current_user = get_current_user()
+    if current_user:
         try:
-            response = cart_items_table.query(
-                KeyConditionExpression=Key('user_email').eq(session['user_email'])
-            )
-            cart_count = sum(item.get('quantity', 0) for item in response.get('Items', []))
+            cart_count = get_cart_count()
         except ClientError:
             pass
     return dict(cart_count=cart_count, current_user=current_user)
@@ -166,19 +732,25 @@ def inject_globals():
 def index():
     """Homepage with featured bakeries."""
     try:
-        # Get all approved bakeries
-        response = bakeries_table.scan(
-            FilterExpression=Attr('is_approved').eq(True)
+        # Read only as many cards as the page shows, concurrently
+        bakeries_fut = EXECUTOR.submit(
+            read_first, bakeries_table.scan, 8,
+            FilterExpression=APPROVED_FILTER,
+            **projection(*BAKERY_CARD_FIELDS)
         )
-        all_bakeries = response.get('Items', [])
-        
-        featured = [b for b in all_bakeries if b.get('is_featured')][:6]
-        
-        # Get bestseller products
-        prod_response = products_table.scan(
-            FilterExpression=Attr('is_bestseller').eq(True) & Attr('is_available').eq(True)
+        featured_fut = EXECUTOR.submit(
+            read_first, bakeries_table.scan, 6,
+            FilterExpression=FEATURED_FILTER,
+            **projection(*BAKERY_CARD_FIELDS)
+        )
+        popular_fut = EXECUTOR.submit(
+            read_first, products_table.scan, 8,
+            FilterExpression=BESTSELLER_FILTER,
+            **projection(*PRODUCT_CARD_FIELDS)
         )
-        popular = prod_response.get('Items', [])[:8]
+        all_bakeries = bakeries_fut.result()
+        featured = featured_fut.result()
+        popular = popular_fut.result()
     except ClientError as e:
         print(f"Error: {e}")
         all_bakeries = []
@@ -187,7 +759,7 @@ def index():
     
     return render_template('main/index.html',
                           featured_bakeries=featured,
-                          bakeries=all_bakeries[:8],
+                          bakeries=all_bakeries,
                           popular_products=popular)
 
 @app.route('/bakeries')
@@ -198,7 +770,8 @@ def bakeries_list():
     
     try:
         response = bakeries_table.scan(
-            FilterExpression=Attr('is_approved').eq(True)
+            FilterExpression=APPROVED_FILTER,
+            **projection(*BAKERY_CARD_FIELDS)
         )
         result = response.get('Items', [])
         
@@ -222,41 +795,37 @@ def bakeries_list():
 def bakery_detail(slug):
     """Individual bakery page."""
     try:
-        response = bakeries_table.scan(
-            FilterExpression=Attr('slug').eq(slug) & Attr('is_approved').eq(True)
+        bakeries_list = query_index(
+            bakeries_table, 'slug-index', Key('slug').eq(slug),
+            FilterExpression=APPROVED_FILTER
         )
-        bakeries_list = response.get('Items', [])
         if not bakeries_list:
             return "Bakery not found", 404
         bakery = bakeries_list[0]
+        bakery_key = Key('bakery_id').eq(bakery['bakery_id'])
         
-        # Get categories
-        cat_response = categories_table.scan(
-            FilterExpression=Attr('bakery_id').eq(bakery['bakery_id'])
-        )
-        bakery_categories = cat_response.get('Items', [])
-        
-        # Get products
-        prod_response = products_table.scan(
-            FilterExpression=Attr('bakery_id').eq(bakery['bakery_id']) & Attr('is_available').eq(True)
-        )
-        bakery_products = prod_response.get('Items', [])
-        
-        # Get reviews
-        rev_response = reviews_table.scan(
-            FilterExpression=Attr('bakery_id').eq(bakery['bakery_id'])
-        )
-        bakery_reviews = rev_response.get('Items', [])
+        # Get categories, products and reviews concurrently. Categories skip the
+        # per-process cache: other workers would hide a new category (and its products)
+        cat_fut = EXECUTOR.submit(query_index, categories_table, 'bakery_id-index', bakery_key)
+        prod_fut = EXECUTOR.submit(query_index, products_table, 'bakery_id-index', bakery_key,
+                                   FilterExpression=AVAILABLE_FILTER)
+        rev_fut = EXECUTOR.submit(query_index, reviews_table, 'bakery_id-index', bakery_key)
         
     except ClientError as e:
         print(f"Error: {e}")
         return "Error loading bakery", 500
     
-    return render_template('main/bakery_detail.html',
-                          bakery=bakery,
-                          categories=bakery_categories,
-                          products=bakery_products,
-                          reviews=bakery_reviews)
+    # Pop flashes now: the session cookie is written before the streamed body
+    get_flashed_messages()
+    
+    # Stream the page so the header goes out while the menu reads finish
+    # Every value is normalised first: a template error mid-stream truncates the page
+    return stream_template('main/bakery_detail.html',
+                          bakery=menu_bakery(bakery),
+                          categories=LazyResult(cat_fut, menu_categories),
+                          products_by_category=LazyResult(prod_fut, products_by_category),
+                          uncategorized_products=LazyResult(prod_fut, uncategorized_products),
+                          reviews=LazyResult(rev_fut, menu_reviews))
 
 @app.route('/product/<product_id>')
 def product_detail(product_id):
@@ -267,14 +836,17 @@ def product_detail(product_id):
         if not product:
             return "Product not found", 404
         
-        bakery_response = bakeries_table.get_item(Key={'bakery_id': product.get('bakery_id')})
-        bakery = bakery_response.get('Item')
-        
-        # Get related products
-        related_response = products_table.scan(
-            FilterExpression=Attr('bakery_id').eq(product.get('bakery_id')) & Attr('product_id').ne(product_id)
+        # Get bakery and related products concurrently
+        bakery_fut = EXECUTOR.submit(bakeries_table.get_item, Key={'bakery_id': product.get('bakery_id')})
+        related_fut = EXECUTOR.submit(
+            read_first, products_table.query, 4, page_size=5,
+            IndexName='bakery_id-index',
+            KeyConditionExpression=Key('bakery_id').eq(product.get('bakery_id')),
+            FilterExpression=Attr('product_id').ne(product_id)
         )
-        related = related_response.get('Items', [])[:4]
+        
+        bakery = bakery_fut.result().get('Item')
+        related = related_fut.result()
     except ClientError as e:
         print(f"Error: {e}")
         return "Error loading product", 500
@@ -289,12 +861,26 @@ def search():
     """Search results page."""
     query = request.args.get('q', '')
     
+    # Ranked, typo-tolerant search when the index is configured
+    if search_client and query:
+        try:
+            results = search_index(query)
+        except ClientError:
+            results = None
+        if results is not None:
+            return render_template('main/search_results.html',
+                                  query=query,
+                                  bakeries=results[0],
+                                  products=results[1])
+    
     try:
-        bakery_response = bakeries_table.scan(FilterExpression=Attr('is_approved').eq(True))
+        bakery_response = bakeries_table.scan(FilterExpression=APPROVED_FILTER,
+                                              **projection(*BAKERY_CARD_FIELDS))
         all_bakeries = bakery_response.get('Items', [])
         found_bakeries = [b for b in all_bakeries if query.lower() in b.get('name', '').lower()][:6]
         
-        prod_response = products_table.scan(FilterExpression=Attr('is_available').eq(True))
+        prod_response = products_table.scan(FilterExpression=AVAILABLE_FILTER,
+                                            **projection(*PRODUCT_CARD_FIELDS))
         all_products = prod_response.get('Items', [])
         found_products = [p for p in all_products if query.lower() in p.get('name', '').lower()][:12]
     except ClientError:
@@ -359,6 +945,11 @@ def login():
                     return render_template('auth/login.html')
                 
                 session['user_email'] = email
+                if user.get('role') == 'baker':
+                    # Remember the bakery so later requests can read it by key
+                    bakery = get_bakery_for_user(email)
+                    if bakery:
+                        session['bakery_id'] = bakery['bakery_id']
                 send_notification("User Login", f"User {email} has logged in.")
                 flash(f"Welcome back, {user['name']}!", 'success')
                 
@@ -398,11 +989,12 @@ def register():
             # Create user
             users_table.put_item(Item={
                 'email': email,
-                'password_hash': generate_password_hash(password),
+                'password_hash': generate_password_hash(password, method=PASSWORD_HASH_METHOD),
                 'name': name,
                 'phone': phone,
                 'role': 'customer',
                 'is_active': True,
+                'cart_count': 0,
                 'created_at': datetime.utcnow().isoformat()
             })
             
@@ -441,11 +1033,12 @@ def register_baker():
             # Create user
             users_table.put_item(Item={
                 'email': email,
-                'password_hash': generate_password_hash(password),
+                'password_hash': generate_password_hash(password, method=PASSWORD_HASH_METHOD),
                 'name': name,
                 'phone': phone,
                 'role': 'baker',
                 'is_active': True,
+                'cart_count': 0,
                 'created_at': datetime.utcnow().isoformat()
             })
             
@@ -461,11 +1054,13 @@ def register_baker():
                 'pincode': pincode,
                 'phone': phone,
                 'is_approved': False,
+                'pending': PENDING,
                 'is_open': True,
                 'is_featured': False,
                 'rating': 0,
                 'created_at': datetime.utcnow().isoformat()
             })
+            forget_bakery(email)
             
             send_notification("New Baker Registration", 
                             f"Baker {name} ({email}) registered bakery: {bakery_name}")
@@ -481,6 +1076,7 @@ def register_baker():
 def logout():
     """User logout."""
     session.pop('user_email', None)
+    session.pop('bakery_id', None)
     flash('You have been logged out.', 'info')
     return redirect(url_for('index'))
 
@@ -494,14 +1090,16 @@ def view_cart():
     
     try:
         response = cart_items_table.query(
-            KeyConditionExpression=Key('user_email').eq(user_email)
+            KeyConditionExpression=Key('user_email').eq(user_email),
+            **projection('product_id', 'quantity')
         )
+        cart_rows = response.get('Items', [])
+        products = fetch_products([item['product_id'] for item in cart_rows])
         cart_data = []
         total = 0
         
-        for item in response.get('Items', []):
-            prod_response = products_table.get_item(Key={'product_id': item['product_id']})
-            product = prod_response.get('Item')
+        for item in cart_rows:
+            product = products.get(item['product_id'])
             if product:
                 quantity = int(item.get('quantity', 0))
                 price = float(product.get('price', 0))
@@ -537,27 +1135,13 @@ def add_to_cart():
         
         user_email = session['user_email']
         
-        # Check existing cart item
-        cart_response = cart_items_table.get_item(
-            Key={'user_email': user_email, 'product_id': product_id}
+        # Add to the existing line or create it, in one atomic write
+        cart_items_table.update_item(
+            Key={'user_email': user_email, 'product_id': product_id},
+            UpdateExpression='ADD quantity :q SET created_at = if_not_exists(created_at, :t)',
+            ExpressionAttributeValues={':q': quantity, ':t': datetime.utcnow().isoformat()}
         )
-        
-        if 'Item' in cart_response:
-            # Update quantity
-            new_quantity = int(cart_response['Item'].get('quantity', 0)) + quantity
-            cart_items_table.update_item(
-                Key={'user_email': user_email, 'product_id': product_id},
-                UpdateExpression='SET quantity = :q',
-                ExpressionAttributeValues={':q': new_quantity}
-            )
-        else:
-            # Add new item
-            cart_items_table.put_item(Item={
-                'user_email': user_email,
-                'product_id': product_id,
-                'quantity': quantity,
-                'created_at': datetime.utcnow().isoformat()
-            })
+        adjust_cart_count(user_email, quantity)
         
         flash(f"{product['name']} added to cart!", 'success')
         
@@ -580,16 +1164,20 @@ def update_cart():
     
     try:
         if quantity <= 0:
-            cart_items_table.delete_item(
-                Key={'user_email': user_email, 'product_id': product_id}
+            response = cart_items_table.delete_item(
+                Key={'user_email': user_email, 'product_id': product_id},
+                ReturnValues='ALL_OLD'
             )
+            adjust_cart_count(user_email, -int(response.get('Attributes', {}).get('quantity', 0)))
             flash('Item removed from cart.', 'success')
         else:
-            cart_items_table.update_item(
+            response = cart_items_table.update_item(
                 Key={'user_email': user_email, 'product_id': product_id},
                 UpdateExpression='SET quantity = :q',
-                ExpressionAttributeValues={':q': quantity}
+                ExpressionAttributeValues={':q': quantity},
+                ReturnValues='UPDATED_OLD'
             )
+            adjust_cart_count(user_email, quantity - int(response.get('Attributes', {}).get('quantity', 0)))
             flash('Cart updated.', 'success')
     except ClientError as e:
         print(f"Update cart error: {e}")
@@ -603,9 +1191,11 @@ def remove_from_cart(product_id):
     user_email = session['user_email']
     
     try:
-        cart_items_table.delete_item(
-            Key={'user_email': user_email, 'product_id': product_id}
+        response = cart_items_table.delete_item(
+            Key={'user_email': user_email, 'product_id': product_id},
+            ReturnValues='ALL_OLD'
         )
+        adjust_cart_count(user_email, -int(response.get('Attributes', {}).get('quantity', 0)))
         flash('Item removed from cart.', 'success')
     except ClientError as e:
         print(f"Remove from cart error: {e}")
@@ -620,12 +1210,13 @@ def clear_cart():
     
     try:
         response = cart_items_table.query(
-            KeyConditionExpression=Key('user_email').eq(user_email)
+            KeyConditionExpression=Key('user_email').eq(user_email),
+            **projection('product_id')
         )
-        for item in response.get('Items', []):
-            cart_items_table.delete_item(
-                Key={'user_email': user_email, 'product_id': item['product_id']}
-            )
+        with cart_items_table.batch_writer() as batch:
+            for item in response.get('Items', []):
+                batch.delete_item(Key={'user_email': user_email, 'product_id': item['product_id']})
+        reset_cart_count(user_email)
         flash('Cart cleared.', 'success')
     except ClientError as e:
         print(f"Clear cart error: {e}")
@@ -642,7 +1233,8 @@ def checkout():
     
     try:
         cart_response = cart_items_table.query(
-            KeyConditionExpression=Key('user_email').eq(user_email)
+            KeyConditionExpression=Key('user_email').eq(user_email),
+            **projection('product_id', 'quantity')
         )
         cart_items_list = cart_response.get('Items', [])
         
@@ -650,6 +1242,8 @@ def checkout():
             flash('Your cart is empty.', 'warning')
             return redirect(url_for('view_cart'))
         
+        products = fetch_products([item['product_id'] for item in cart_items_list])
+        
         if request.method == 'POST':
             # Create order
             order_number = f"LC{datetime.utcnow().strftime('%Y%m%d%H%M')}{str(uuid.uuid4().hex)[:6].upper()}"
@@ -658,8 +1252,7 @@ def checkout():
             total = 0
             bakery_id = None
             for cart_item in cart_items_list:
-                prod_response = products_table.get_item(Key={'product_id': cart_item['product_id']})
-                product = prod_response.get('Item')
+                product = products.get(cart_item['product_id'])
                 if product:
                     quantity = int(cart_item['quantity'])
                     price = float(product['price'])
@@ -674,8 +1267,7 @@ def checkout():
                     total += subtotal
                     bakery_id = product.get('bakery_id')
             
-            # Save order
-            orders_table.put_item(Item={
+            order_item = {
                 'order_number': order_number,
                 'customer_email': user_email,
                 'bakery_id': bakery_id,
@@ -685,13 +1277,37 @@ def checkout():
                 'payment_method': request.form.get('payment_method', 'cod'),
                 'delivery_address': request.form.get('address', ''),
                 'created_at': datetime.utcnow().isoformat()
-            })
+            }
             
-            # Clear cart
-            for cart_item in cart_items_list:
-                cart_items_table.delete_item(
-                    Key={'user_email': user_email, 'product_id': cart_item['product_id']}
-                )
+            # Save the order, clear the cart, reset its counter and add the order to the
+            # bakery's stats atomically
+            stats_update = order_stats_update(bakery_id, Decimal(str(total)), order_item['created_at']) if bakery_id else None
+            if len(cart_items_list) + 3 <= TRANSACT_MAX_ITEMS:
+                # The resource's client marshals plain Python values itself
+                transact_items = [{'Put': {'TableName': orders_table.name, 'Item': order_item}}]
+                transact_items += [{'Delete': {
+                    'TableName': cart_items_table.name,
+                    'Key': {'user_email': user_email, 'product_id': cart_item['product_id']}
+                }} for cart_item in cart_items_list]
+                transact_items.append({'Update': {
+                    'TableName': users_table.name,
+                    'Key': {'email': user_email},
+                    'UpdateExpression': 'SET cart_count = :zero',
+                    'ExpressionAttributeValues': {':zero': 0}
+                }})
+                if stats_update:
+                    transact_items.append({'Update': {'TableName': bakeries_table.name, **stats_update}})
+                # Through DAX when configured, like the fallback's bakery write, so its
+                # item cache sees the stats update
+                read_cache.meta.client.transact_write_items(TransactItems=transact_items)
+            else:
+                orders_table.put_item(Item=order_item)
+                with cart_items_table.batch_writer() as batch:
+                    for cart_item in cart_items_list:
+                        batch.delete_item(Key={'user_email': user_email, 'product_id': cart_item['product_id']})
+                reset_cart_count(user_email)
+                if stats_update:
+                    bakeries_table.update_item(**stats_update)
             
             send_notification("New Order Placed", 
                             f"Order {order_number} placed by {user_email}. Total: ${total:.2f}")
@@ -700,16 +1316,13 @@ def checkout():
             return redirect(url_for('order_confirmation', order_number=order_number))
         
         # Get user addresses
-        addr_response = addresses_table.scan(
-            FilterExpression=Attr('user_email').eq(user_email)
-        )
-        user_addresses = addr_response.get('Items', [])
+        user_addresses = query_index(addresses_table, 'user_email-index', Key('user_email').eq(user_email),
+                                     **projection(*ADDRESS_FIELDS))
         
         cart_data = []
         total = 0
         for cart_item in cart_items_list:
-            prod_response = products_table.get_item(Key={'product_id': cart_item['product_id']})
-            product = prod_response.get('Item')
+            product = products.get(cart_item['product_id'])
             if product:
                 quantity = int(cart_item['quantity'])
                 price = float(product['price'])
@@ -750,18 +1363,30 @@ def order_confirmation(order_number):
 def order_history():
     """Order history."""
     user_email = session['user_email']
+    cursor = request.args.get('cursor')
+    query_kwargs = projection(*ORDER_LIST_FIELDS)
+    start_key = decode_cursor(cursor) if cursor else None
+    if start_key:
+        query_kwargs['ExclusiveStartKey'] = start_key
     
     try:
-        response = orders_table.scan(
-            FilterExpression=Attr('customer_email').eq(user_email)
+        response = orders_table.query(
+            IndexName='customer_email-created_at-index',
+            KeyConditionExpression=Key('customer_email').eq(user_email),
+            ScanIndexForward=False,
+            Limit=20,
+            **query_kwargs
         )
-        user_orders = sorted(response.get('Items', []), 
-                           key=lambda x: x.get('created_at', ''), 
-                           reverse=True)
+        user_orders = response.get('Items', [])
+        next_cursor = encode_cursor(response['LastEvaluatedKey']) if 'LastEvaluatedKey' in response else None
     except ClientError:
         user_orders = []
+        next_cursor = None
     
-    return render_template('customer/orders.html', orders=user_orders)
+    return render_template('customer/orders.html',
+                          orders=user_orders,
+                          cursor=cursor,
+                          next_cursor=next_cursor)
 
 @app.route('/orders/<order_number>')
 @login_required
@@ -785,48 +1410,41 @@ def order_detail(order_number):
 # ==================== BAKER ROUTES ====================
 
 @app.route('/baker/dashboard')
-@login_required
 @baker_required
 def baker_dashboard():
     """Baker dashboard."""
-    user_email = session['user_email']
-    
     try:
         # Get bakery
-        response = bakeries_table.scan(
-            FilterExpression=Attr('owner_email').eq(user_email)
-        )
-        bakeries_list = response.get('Items', [])
-        if not bakeries_list:
+        bakery = current_bakery()
+        if not bakery:
             flash('No bakery found for your account.', 'danger')
             return redirect(url_for('index'))
-        bakery = bakeries_list[0]
         
-        # Get orders
-        orders_response = orders_table.scan(
-            FilterExpression=Attr('bakery_id').eq(bakery['bakery_id'])
-        )
-        bakery_orders = orders_response.get('Items', [])
-        
-        # Get products
-        products_response = products_table.scan(
-            FilterExpression=Attr('bakery_id').eq(bakery['bakery_id'])
-        )
-        bakery_products = products_response.get('Items', [])
+        # Get orders and products concurrently
+        orders_fut = EXECUTOR.submit(query_index, orders_table, 'bakery_id-created_at-index', Key('bakery_id').eq(bakery['bakery_id']),
+                                     ScanIndexForward=False, **projection(*BAKER_ORDER_FIELDS))
+        products_fut = EXECUTOR.submit(count_items, products_table.query, IndexName='bakery_id-index',
+                                       KeyConditionExpression=Key('bakery_id').eq(bakery['bakery_id']))
+        bakery_orders = orders_fut.result()
+        total_products = products_fut.result()
         
-        # Calculate dashboard stats
+        # Calculate dashboard stats (orders are newest first, so today's are a prefix)
         today = datetime.utcnow().strftime('%Y-%m-%d')
-        today_orders_list = [o for o in bakery_orders if o.get('created_at', '').startswith(today)]
-        today_orders = len(today_orders_list)
-        today_revenue = sum(float(o.get('total_amount', 0)) for o in today_orders_list)
-        total_products = len(bakery_products)
+        today_orders = 0
+        today_revenue = 0
+        for o in bakery_orders:
+            if not o['created_at'].startswith(today):
+                break
+            today_orders += 1
+            amount = o.get('total_amount')
+            today_revenue += float(amount) if amount else 0.0
         total_orders = len(bakery_orders)
         
         # Get pending orders
         pending_orders = [o for o in bakery_orders if o.get('status') == 'pending']
         
-        # Get recent orders (sorted by created_at, limit to 10)
-        recent_orders = sorted(bakery_orders, key=lambda x: x.get('created_at', ''), reverse=True)[:10]
+        # Get recent orders (already newest first, limit to 10)
+        recent_orders = bakery_orders[:10]
         
     except ClientError as e:
         print(f"Baker dashboard error: {e}")
@@ -835,7 +1453,6 @@ def baker_dashboard():
     return render_template('baker/dashboard.html',
                           bakery=bakery,
                           orders=bakery_orders,
-                          products=bakery_products,
                           today_orders=today_orders,
                           today_revenue=today_revenue,
                           total_products=total_products,
@@ -844,33 +1461,20 @@ def baker_dashboard():
                           recent_orders=recent_orders)
 
 @app.route('/baker/products')
-@login_required
 @baker_required
 def baker_products():
     """Baker products list."""
-    user_email = session['user_email']
-    
     try:
         # Get bakery
-        response = bakeries_table.scan(
-            FilterExpression=Attr('owner_email').eq(user_email)
-        )
-        bakeries_list = response.get('Items', [])
-        if not bakeries_list:
+        bakery = current_bakery()
+        if not bakery:
             return redirect(url_for('baker_dashboard'))
-        bakery = bakeries_list[0]
         
-        # Get products
-        products_response = products_table.scan(
-            FilterExpression=Attr('bakery_id').eq(bakery['bakery_id'])
-        )
-        bakery_products = products_response.get('Items', [])
-        
-        # Get categories
-        cat_response = categories_table.scan(
-            FilterExpression=Attr('bakery_id').eq(bakery['bakery_id'])
-        )
-        bakery_categories = cat_response.get('Items', [])
+        # Get products and categories concurrently
+        products_fut = EXECUTOR.submit(query_index, products_table, 'bakery_id-index', Key('bakery_id').eq(bakery['bakery_id']))
+        cat_fut = EXECUTOR.submit(get_categories, bakery['bakery_id'])
+        bakery_products = products_fut.result()
+        bakery_categories = cat_fut.result()
         
     except ClientError:
         bakery_products = []
@@ -883,20 +1487,13 @@ def baker_products():
                           categories=bakery_categories)
 
 @app.route('/baker/products/add', methods=['GET', 'POST'])
-@login_required
 @baker_required
 def baker_add_product():
     """Add new product."""
-    user_email = session['user_email']
-    
     try:
-        response = bakeries_table.scan(
-            FilterExpression=Attr('owner_email').eq(user_email)
-        )
-        bakeries_list = response.get('Items', [])
-        if not bakeries_list:
+        bakery = current_bakery()
+        if not bakery:
             return redirect(url_for('baker_dashboard'))
-        bakery = bakeries_list[0]
         
         if request.method == 'POST':
             product_id = str(uuid.uuid4())
@@ -906,8 +1503,7 @@ def baker_add_product():
             if 'image' in request.files:
                 image = request.files['image']
                 if image.filename:
-                    image_filename = secure_filename(f"{product_id}_{image.filename}")
-                    image.save(os.path.join(UPLOAD_FOLDER, 'products', image_filename))
+                    image_filename = store_upload(image, 'products', secure_filename(f"{product_id}_{image.filename}"))
             
             products_table.put_item(Item={
                 'product_id': product_id,
@@ -932,10 +1528,7 @@ def baker_add_product():
             return redirect(url_for('baker_products'))
         
         # Get categories
-        cat_response = categories_table.scan(
-            FilterExpression=Attr('bakery_id').eq(bakery['bakery_id'])
-        )
-        bakery_categories = cat_response.get('Items', [])
+        bakery_categories = get_categories(bakery['bakery_id'])
         
     except ClientError as e:
         print(f"Add product error: {e}")
@@ -947,41 +1540,17 @@ def baker_add_product():
                           categories=bakery_categories)
 
 @app.route('/baker/products/<product_id>/edit', methods=['GET', 'POST'])
-@login_required
 @baker_required
 def baker_edit_product(product_id):
     """Edit a product."""
-    user_email = session['user_email']
-    
     try:
-        response = bakeries_table.scan(
-            FilterExpression=Attr('owner_email').eq(user_email)
-        )
-        bakeries_list = response.get('Items', [])
-        if not bakeries_list:
-            return redirect(url_for('baker_products'))
-        bakery = bakeries_list[0]
-        
-        # Get the product
-        prod_response = products_table.get_item(Key={'product_id': product_id})
-        product = prod_response.get('Item')
-        
-        if not product or product.get('bakery_id') != bakery['bakery_id']:
-            flash('Product not found.', 'danger')
+        bakery = current_bakery()
+        if not bakery:
             return redirect(url_for('baker_products'))
         
         if request.method == 'POST':
-            # Handle image upload
-            image_filename = product.get('image_url', '')
-            if 'image' in request.files:
-                image = request.files['image']
-                if image and image.filename:
-                    image_filename = f"{product_id}_{image.filename}"
-                    os.makedirs(os.path.join(UPLOAD_FOLDER, 'products'), exist_ok=True)
-                    image.save(os.path.join(UPLOAD_FOLDER, 'products', image_filename))
-            
             # Update product
-            update_expr = 'SET #n = :n, description = :desc, price = :p, discount_price = :dp, category_id = :cat, stock_quantity = :sq, is_available = :av, is_vegetarian = :veg, is_bestseller = :bs, image_url = :img'
+            update_expr = 'SET #n = :n, description = :desc, price = :p, discount_price = :dp, category_id = :cat, stock_quantity = :sq, is_available = :av, is_vegetarian = :veg, is_bestseller = :bs'
             expr_names = {'#n': 'name'}
             expr_values = {
                 ':n': request.form.get('name'),
@@ -992,13 +1561,20 @@ def baker_edit_product(product_id):
                 ':sq': int(request.form.get('stock_quantity', 0)),
                 ':av': request.form.get('is_available') == 'on',
                 ':veg': request.form.get('is_vegetarian') == 'on',
-                ':bs': request.form.get('is_bestseller') == 'on',
-                ':img': image_filename
+                ':bs': request.form.get('is_bestseller') == 'on'
             }
             
+            # Handle image upload; the stored image is kept when none is sent
+            image = request.files.get('image')
+            if image and image.filename:
+                update_expr += ', image_url = :img'
+                expr_values[':img'] = store_upload(image, 'products', secure_filename(f"{product_id}_{image.filename}"))
+            
+            # The ownership check rides on the write, so the product is not read first
             products_table.update_item(
                 Key={'product_id': product_id},
                 UpdateExpression=update_expr,
+                ConditionExpression=Attr('bakery_id').eq(bakery['bakery_id']),
                 ExpressionAttributeNames=expr_names,
                 ExpressionAttributeValues=expr_values
             )
@@ -1007,14 +1583,21 @@ def baker_edit_product(product_id):
             return redirect(url_for('baker_products'))
         
         # GET request - show form
-        cat_response = categories_table.scan(
-            FilterExpression=Attr('bakery_id').eq(bakery['bakery_id'])
-        )
-        bakery_categories = cat_response.get('Items', [])
+        prod_response = products_table.get_item(Key={'product_id': product_id})
+        product = prod_response.get('Item')
+        
+        if not product or product.get('bakery_id') != bakery['bakery_id']:
+            flash('Product not found.', 'danger')
+            return redirect(url_for('baker_products'))
+        
+        bakery_categories = get_categories(bakery['bakery_id'])
         
     except ClientError as e:
-        print(f"Edit product error: {e}")
-        flash('Error editing product.', 'danger')
+        if condition_failed(e):
+            flash('Product not found.', 'danger')
+        else:
+            print(f"Edit product error: {e}")
+            flash('Error editing product.', 'danger')
         return redirect(url_for('baker_products'))
     
     return render_template('baker/product_form.html',
@@ -1023,29 +1606,18 @@ def baker_edit_product(product_id):
                           categories=bakery_categories)
 
 @app.route('/baker/orders')
-@login_required
 @baker_required
 def baker_orders():
     """Baker orders list."""
-    user_email = session['user_email']
-    
     try:
         # Get bakery
-        response = bakeries_table.scan(
-            FilterExpression=Attr('owner_email').eq(user_email)
-        )
-        bakeries_list = response.get('Items', [])
-        if not bakeries_list:
+        bakery = current_bakery()
+        if not bakery:
             return redirect(url_for('baker_dashboard'))
-        bakery = bakeries_list[0]
         
         # Get orders
-        orders_response = orders_table.scan(
-            FilterExpression=Attr('bakery_id').eq(bakery['bakery_id'])
-        )
-        bakery_orders = sorted(orders_response.get('Items', []),
-                              key=lambda x: x.get('created_at', ''),
-                              reverse=True)
+        bakery_orders = query_index(orders_table, 'bakery_id-created_at-index', Key('bakery_id').eq(bakery['bakery_id']),
+                                    ScanIndexForward=False, **projection(*BAKER_ORDER_FIELDS))
     except ClientError:
         bakery = {}
         bakery_orders = []
@@ -1055,7 +1627,6 @@ def baker_orders():
                           orders=bakery_orders)
 
 @app.route('/baker/orders/<order_number>/update', methods=['POST'])
-@login_required
 @baker_required
 def baker_update_order(order_number):
     """Update order status."""
@@ -1079,89 +1650,82 @@ def baker_update_order(order_number):
     return redirect(url_for('baker_orders'))
 
 @app.route('/baker/toggle-status', methods=['POST'])
-@login_required
 @baker_required
 def baker_toggle_status():
     """Toggle bakery open/closed status."""
-    user_email = session['user_email']
-    
     try:
-        response = bakeries_table.scan(
-            FilterExpression=Attr('owner_email').eq(user_email)
-        )
-        bakeries_list = response.get('Items', [])
-        if bakeries_list:
-            bakery = bakeries_list[0]
-            new_status = not bakery.get('is_open', True)
-            
-            bakeries_table.update_item(
-                Key={'bakery_id': bakery['bakery_id']},
-                UpdateExpression='SET is_open = :s',
-                ExpressionAttributeValues={':s': new_status}
-            )
+        bakery = current_bakery()
+        if bakery:
+            # Flip the stored flag, not the cached copy (another worker may have changed it):
+            # close if open (the default); a failed condition means it is closed, so open it
+            key = {'bakery_id': bakery['bakery_id']}
+            try:
+                response = bakeries_table.update_item(
+                    Key=key,
+                    UpdateExpression='SET is_open = :f',
+                    ConditionExpression='attribute_exists(bakery_id) AND (attribute_not_exists(is_open) OR is_open = :t)',
+                    ExpressionAttributeValues={':f': False, ':t': True},
+                    ReturnValues='UPDATED_NEW'
+                )
+            except ClientError as e:
+                if not condition_failed(e):
+                    raise
+                response = bakeries_table.update_item(
+                    Key=key,
+                    UpdateExpression='SET is_open = :t',
+                    ConditionExpression='attribute_exists(bakery_id)',
+                    ExpressionAttributeValues={':t': True},
+                    ReturnValues='UPDATED_NEW'
+                )
+            forget_bakery(bakery['owner_email'])
             
-            status_text = 'open' if new_status else 'closed'
+            status_text = 'open' if response['Attributes']['is_open'] else 'closed'
             flash(f"Your bakery is now {status_text}.", 'success')
     except ClientError as e:
-        print(f"Toggle status error: {e}")
-        flash('Error updating status.', 'danger')
+        if condition_failed(e):
+            flash('Bakery not found.', 'danger')
+        else:
+            print(f"Toggle status error: {e}")
+            flash('Error updating status.', 'danger')
     
     return redirect(url_for('baker_dashboard'))
 
 @app.route('/baker/products/<product_id>/delete', methods=['POST'])
-@login_required
 @baker_required
 def baker_delete_product(product_id):
     """Delete a product."""
-    user_email = session['user_email']
-    
     try:
         # Verify product belongs to baker's bakery
-        response = bakeries_table.scan(
-            FilterExpression=Attr('owner_email').eq(user_email)
-        )
-        bakeries_list = response.get('Items', [])
-        if not bakeries_list:
+        bakery = current_bakery()
+        if not bakery:
             flash('Bakery not found.', 'danger')
             return redirect(url_for('baker_products'))
         
-        bakery = bakeries_list[0]
-        
-        # Check product belongs to this bakery
-        prod_response = products_table.get_item(Key={'product_id': product_id})
-        product = prod_response.get('Item')
-        
-        if product and product.get('bakery_id') == bakery['bakery_id']:
-            products_table.delete_item(Key={'product_id': product_id})
-            flash('Product deleted successfully.', 'success')
-        else:
-            flash('Product not found.', 'danger')
+        # Delete only if the product belongs to this bakery
+        products_table.delete_item(
+            Key={'product_id': product_id},
+            ConditionExpression=Attr('bakery_id').eq(bakery['bakery_id'])
+        )
+        flash('Product deleted successfully.', 'success')
     except ClientError as e:
-        print(f"Delete product error: {e}")
-        flash('Error deleting product.', 'danger')
+        if condition_failed(e):
+            flash('Product not found.', 'danger')
+        else:
+            print(f"Delete product error: {e}")
+            flash('Error deleting product.', 'danger')
     
     return redirect(url_for('baker_products'))
 
 @app.route('/baker/categories')
-@login_required
 @baker_required
 def baker_categories():
     """Baker categories management."""
-    user_email = session['user_email']
-    
     try:
-        response = bakeries_table.scan(
-            FilterExpression=Attr('owner_email').eq(user_email)
-        )
-        bakeries_list = response.get('Items', [])
-        if not bakeries_list:
+        bakery = current_bakery()
+        if not bakery:
             return redirect(url_for('baker_dashboard'))
-        bakery = bakeries_list[0]
         
-        cat_response = categories_table.scan(
-            FilterExpression=Attr('bakery_id').eq(bakery['bakery_id'])
-        )
-        bakery_categories = cat_response.get('Items', [])
+        bakery_categories = get_categories(bakery['bakery_id'])
     except ClientError:
         bakery = {}
         bakery_categories = []
@@ -1171,21 +1735,14 @@ def baker_categories():
                           categories=bakery_categories)
 
 @app.route('/baker/categories/add', methods=['POST'])
-@login_required
 @baker_required
 def baker_add_category():
     """Add a new category."""
-    user_email = session['user_email']
-    
     try:
-        response = bakeries_table.scan(
-            FilterExpression=Attr('owner_email').eq(user_email)
-        )
-        bakeries_list = response.get('Items', [])
-        if not bakeries_list:
+        bakery = current_bakery()
+        if not bakery:
             flash('Bakery not found.', 'danger')
             return redirect(url_for('baker_categories'))
-        bakery = bakeries_list[0]
         
         category_id = str(uuid.uuid4())
         categories_table.put_item(Item={
@@ -1196,6 +1753,7 @@ def baker_add_category():
             'is_active': True,
             'created_at': datetime.utcnow().isoformat()
         })
+        categories_cache.pop(bakery['bakery_id'])
         
         flash('Category added successfully!', 'success')
     except ClientError as e:
@@ -1205,97 +1763,78 @@ def baker_add_category():
     return redirect(url_for('baker_categories'))
 
 @app.route('/baker/category/<category_id>/edit', methods=['POST'])
-@login_required
 @baker_required
 def baker_edit_category(category_id):
     """Edit a category."""
-    user_email = session['user_email']
-    
     try:
-        response = bakeries_table.scan(
-            FilterExpression=Attr('owner_email').eq(user_email)
-        )
-        bakeries_list = response.get('Items', [])
-        if not bakeries_list:
+        bakery = current_bakery()
+        if not bakery:
             flash('Bakery not found.', 'danger')
             return redirect(url_for('baker_categories'))
-        bakery = bakeries_list[0]
         
-        # Verify category belongs to this bakery
-        cat_response = categories_table.get_item(Key={'category_id': category_id})
-        category = cat_response.get('Item')
-        
-        if category and category.get('bakery_id') == bakery['bakery_id']:
-            new_name = request.form.get('name', category.get('name'))
-            is_active = request.form.get('is_active') == 'on'
-            
-            categories_table.update_item(
-                Key={'category_id': category_id},
-                UpdateExpression='SET #n = :n, is_active = :a',
-                ExpressionAttributeNames={'#n': 'name'},
-                ExpressionAttributeValues={':n': new_name, ':a': is_active}
-            )
-            flash('Category updated.', 'success')
-        else:
-            flash('Category not found.', 'danger')
+        update_expr = 'SET is_active = :a'
+        expr_values = {':a': request.form.get('is_active') == 'on'}
+        update_kwargs = {}
+        if 'name' in request.form:
+            update_expr += ', #n = :n'
+            expr_values[':n'] = request.form['name']
+            update_kwargs['ExpressionAttributeNames'] = {'#n': 'name'}
+        
+        # Update only if the category belongs to this bakery
+        categories_table.update_item(
+            Key={'category_id': category_id},
+            UpdateExpression=update_expr,
+            ConditionExpression=Attr('bakery_id').eq(bakery['bakery_id']),
+            ExpressionAttributeValues=expr_values,
+            **update_kwargs
+        )
+        categories_cache.pop(bakery['bakery_id'])
+        flash('Category updated.', 'success')
     except ClientError as e:
-        print(f"Edit category error: {e}")
-        flash('Error updating category.', 'danger')
+        if condition_failed(e):
+            flash('Category not found.', 'danger')
+        else:
+            print(f"Edit category error: {e}")
+            flash('Error updating category.', 'danger')
     
     return redirect(url_for('baker_categories'))
 
 @app.route('/baker/categories/<category_id>/delete', methods=['POST'])
-@login_required
 @baker_required
 def baker_delete_category(category_id):
     """Delete a category."""
-    user_email = session['user_email']
-    
     try:
-        response = bakeries_table.scan(
-            FilterExpression=Attr('owner_email').eq(user_email)
-        )
-        bakeries_list = response.get('Items', [])
-        if not bakeries_list:
+        bakery = current_bakery()
+        if not bakery:
             flash('Bakery not found.', 'danger')
             return redirect(url_for('baker_categories'))
-        bakery = bakeries_list[0]
         
-        # Verify category belongs to this bakery
-        cat_response = categories_table.get_item(Key={'category_id': category_id})
-        category = cat_response.get('Item')
-        
-        if category and category.get('bakery_id') == bakery['bakery_id']:
-            categories_table.delete_item(Key={'category_id': category_id})
-            flash('Category deleted.', 'success')
-        else:
-            flash('Category not found.', 'danger')
+        # Delete only if the category belongs to this bakery
+        categories_table.delete_item(
+            Key={'category_id': category_id},
+            ConditionExpression=Attr('bakery_id').eq(bakery['bakery_id'])
+        )
+        categories_cache.pop(bakery['bakery_id'])
+        flash('Category deleted.', 'success')
     except ClientError as e:
-        print(f"Delete category error: {e}")
-        flash('Error deleting category.', 'danger')
+        if condition_failed(e):
+            flash('Category not found.', 'danger')
+        else:
+            print(f"Delete category error: {e}")
+            flash('Error deleting category.', 'danger')
     
     return redirect(url_for('baker_categories'))
 
 @app.route('/baker/reviews')
-@login_required
 @baker_required
 def baker_reviews():
     """Baker reviews management."""
-    user_email = session['user_email']
-    
     try:
-        response = bakeries_table.scan(
-            FilterExpression=Attr('owner_email').eq(user_email)
-        )
-        bakeries_list = response.get('Items', [])
-        if not bakeries_list:
+        bakery = current_bakery()
+        if not bakery:
             return redirect(url_for('baker_dashboard'))
-        bakery = bakeries_list[0]
         
-        rev_response = reviews_table.scan(
-            FilterExpression=Attr('bakery_id').eq(bakery['bakery_id'])
-        )
-        bakery_reviews = rev_response.get('Items', [])
+        bakery_reviews = query_index(reviews_table, 'bakery_id-index', Key('bakery_id').eq(bakery['bakery_id']))
     except ClientError:
         bakery = {}
         bakery_reviews = []
@@ -1305,20 +1844,13 @@ def baker_reviews():
                           reviews=bakery_reviews)
 
 @app.route('/baker/analytics')
-@login_required
 @baker_required
 def baker_analytics():
     """Baker analytics page."""
-    user_email = session['user_email']
-    
     try:
-        response = bakeries_table.scan(
-            FilterExpression=Attr('owner_email').eq(user_email)
-        )
-        bakeries_list = response.get('Items', [])
-        if not bakeries_list:
+        bakery = current_bakery()
+        if not bakery:
             return redirect(url_for('baker_dashboard'))
-        bakery = bakeries_list[0]
         
         # Ensure bakery has required fields
         if 'rating' not in bakery:
@@ -1326,28 +1858,21 @@ def baker_analytics():
         if 'total_reviews' not in bakery:
             bakery['total_reviews'] = 0
         
-        # Get orders for analytics
-        orders_response = orders_table.scan(
-            FilterExpression=Attr('bakery_id').eq(bakery['bakery_id'])
-        )
-        bakery_orders = orders_response.get('Items', [])
-        
-        # Get products count
-        products_response = products_table.scan(
-            FilterExpression=Attr('bakery_id').eq(bakery['bakery_id'])
-        )
-        bakery_products = products_response.get('Items', [])
-        total_products = len(bakery_products)
+        # Get the running order stats and products count concurrently
+        stats_fut = EXECUTOR.submit(get_bakery_stats, bakery['bakery_id'])
+        products_fut = EXECUTOR.submit(count_items, products_table.query, IndexName='bakery_id-index',
+                                       KeyConditionExpression=Key('bakery_id').eq(bakery['bakery_id']))
+        stats = stats_fut.result()
+        total_products = products_fut.result()
         
         # Calculate analytics
-        total_revenue = sum(float(o.get('total_amount', 0)) for o in bakery_orders)
-        total_orders = len(bakery_orders)
+        total_revenue = float(stats.get('total_revenue', 0))
+        total_orders = int(stats.get('total_orders', 0))
         
         # This month stats
-        this_month = datetime.utcnow().strftime('%Y-%m')
-        this_month_orders_list = [o for o in bakery_orders if o.get('created_at', '').startswith(this_month)]
-        this_month_orders = len(this_month_orders_list)
-        this_month_revenue = sum(float(o.get('total_amount', 0)) for o in this_month_orders_list)
+        this_month = datetime.utcnow().strftime('%Y_%m')
+        this_month_orders = int(stats.get(f'orders_{this_month}', 0))
+        this_month_revenue = float(stats.get(f'revenue_{this_month}', 0))
         
         # Average order value
         avg_order_value = total_revenue / total_orders if total_orders > 0 else 0
@@ -1357,7 +1882,6 @@ def baker_analytics():
         
     except ClientError:
         bakery = {'rating': 0.0, 'total_reviews': 0}
-        bakery_orders = []
         total_revenue = 0
         total_orders = 0
         this_month_orders = 0
@@ -1368,7 +1892,6 @@ def baker_analytics():
     
     return render_template('baker/analytics.html',
                           bakery=bakery,
-                          orders=bakery_orders,
                           total_revenue=total_revenue,
                           total_orders=total_orders,
                           this_month_orders=this_month_orders,
@@ -1378,20 +1901,13 @@ def baker_analytics():
                           total_products=total_products)
 
 @app.route('/baker/coupons')
-@login_required
 @baker_required
 def baker_coupons():
     """Baker coupons management."""
-    user_email = session['user_email']
-    
     try:
-        response = bakeries_table.scan(
-            FilterExpression=Attr('owner_email').eq(user_email)
-        )
-        bakeries_list = response.get('Items', [])
-        if not bakeries_list:
+        bakery = current_bakery()
+        if not bakery:
             return redirect(url_for('baker_dashboard'))
-        bakery = bakeries_list[0]
     except ClientError:
         bakery = {}
     
@@ -1401,21 +1917,14 @@ def baker_coupons():
                           coupons=[])
 
 @app.route('/baker/coupons/add', methods=['POST'])
-@login_required
 @baker_required
 def baker_add_coupon():
     """Add a new coupon."""
-    user_email = session['user_email']
-    
     try:
-        response = bakeries_table.scan(
-            FilterExpression=Attr('owner_email').eq(user_email)
-        )
-        bakeries_list = response.get('Items', [])
-        if not bakeries_list:
+        bakery = current_bakery()
+        if not bakery:
             flash('Bakery not found.', 'danger')
             return redirect(url_for('baker_coupons'))
-        bakery = bakeries_list[0]
         
         coupon_id = str(uuid.uuid4())
         valid_until = request.form.get('valid_until')
@@ -1445,21 +1954,15 @@ def baker_add_coupon():
     return redirect(url_for('baker_coupons'))
 
 @app.route('/baker/settings', methods=['GET', 'POST'])
-@login_required
 @baker_required
 def baker_settings():
     """Baker settings/profile page."""
-    user_email = session['user_email']
     user = get_current_user()
     
     try:
-        response = bakeries_table.scan(
-            FilterExpression=Attr('owner_email').eq(user_email)
-        )
-        bakeries_list = response.get('Items', [])
-        if not bakeries_list:
+        bakery = current_bakery()
+        if not bakery:
             return redirect(url_for('baker_dashboard'))
-        bakery = bakeries_list[0]
         
         if request.method == 'POST':
             # Update bakery settings
@@ -1505,6 +2008,7 @@ def baker_settings():
                 ExpressionAttributeNames=expr_names,
                 ExpressionAttributeValues=expr_values
             )
+            forget_bakery(bakery['owner_email'])
             
             flash('Settings updated successfully!', 'success')
             return redirect(url_for('baker_settings'))
@@ -1520,63 +2024,76 @@ def baker_settings():
 # ==================== ADMIN ROUTES ====================
 
 @app.route('/admin/dashboard')
-@login_required
 @admin_required
 def admin_dashboard():
     """Admin dashboard."""
     try:
-        users_response = users_table.scan()
-        bakeries_response = bakeries_table.scan()
-        orders_response = orders_table.scan()
-        products_response = products_table.scan()
-        
-        all_users = users_response.get('Items', [])
-        all_bakeries = bakeries_response.get('Items', [])
-        all_orders = orders_response.get('Items', [])
-        all_products = products_response.get('Items', [])
+        # Read the tables concurrently; products and bakeries are only counted, and the
+        # pending approvals come from the sparse pending-index rather than a full scan
+        pending_key = Key('pending').eq(PENDING)
+        products_fut = EXECUTOR.submit(count_items, products_table.scan)
+        bakeries_fut = EXECUTOR.submit(count_items, bakeries_table.scan)
+        pending_count_fut = EXECUTOR.submit(count_items, bakeries_table.query, IndexName='pending-index',
+                                            KeyConditionExpression=pending_key)
+        approvals_fut = EXECUTOR.submit(bakeries_table.query, IndexName='pending-index',
+                                        KeyConditionExpression=pending_key, Limit=5,
+                                        **projection(*BAKERY_ADMIN_FIELDS))
+        users_fut = EXECUTOR.submit(parallel_scan, dynamodb_client.scan, scan_segments(users_table.name),
+                                    TableName=users_table.name, **projection(*USER_STATS_FIELDS))
+        orders_fut = EXECUTOR.submit(parallel_scan, dynamodb_client.scan, scan_segments(orders_table.name),
+                                     TableName=orders_table.name, **projection(*ORDER_STATS_FIELDS))
+        all_users, all_orders = users_fut.result(), orders_fut.result()
         
         # Calculate statistics for dashboard
         total_users = len(all_users)
-        total_bakeries = len(all_bakeries)
+        total_bakeries = bakeries_fut.result()
         total_orders = len(all_orders)
-        total_products = len(all_products)
-        
-        # Count pending bakeries (not approved)
-        pending_bakeries_list = [b for b in all_bakeries if not b.get('is_approved', False)]
-        pending_bakeries = len(pending_bakeries_list)
-        pending_approvals = pending_bakeries_list[:5]  # First 5 for display
-        
-        # Count approved bakeries
-        approved_bakeries = len([b for b in all_bakeries if b.get('is_approved', False)])
-        
-        # Count active users
-        active_users = len([u for u in all_users if u.get('is_active', True)])
-        
-        # Count customers and bakers
-        total_customers = len([u for u in all_users if u.get('role') == 'customer'])
-        total_bakers = len([u for u in all_users if u.get('role') == 'baker'])
-        
-        # Calculate total revenue
-        total_revenue = sum(float(o.get('total_amount', 0)) for o in all_orders)
-        
-        # Today's statistics
+        total_products = products_fut.result()
+        
+        # Count pending bakeries (not approved); every other bakery is approved
+        pending_bakeries = pending_count_fut.result()
+        pending_approvals = approvals_fut.result().get('Items', [])  # First 5 for display
+        approved_bakeries = total_bakeries - pending_bakeries
+        
+        # Count active users, customers and bakers in one pass (raw wire-format items)
+        active_users = total_customers = total_bakers = 0
+        for u in all_users:
+            if 'is_active' not in u or u['is_active'].get('BOOL'):
+                active_users += 1
+            role = u.get('role', {}).get('S')
+            if role == 'customer':
+                total_customers += 1
+            elif role == 'baker':
+                total_bakers += 1
+        
+        # Revenue, today's statistics and the 10 most recent orders in one pass;
+        # only the orders that are displayed get deserialized
         today = datetime.utcnow().strftime('%Y-%m-%d')
-        today_orders_list = [o for o in all_orders if o.get('created_at', '').startswith(today)]
-        today_orders = len(today_orders_list)
-        today_revenue = sum(float(o.get('total_amount', 0)) for o in today_orders_list)
-        
-        # Get recent orders
-        recent_orders = sorted(all_orders, key=lambda x: x.get('created_at', ''), reverse=True)[:10]
+        total_revenue = today_revenue = today_orders = 0
+        recent_heap = []
+        for o in all_orders:
+            # Checkout stores total_amount as a string, so read it whatever its wire type
+            amount = float(DESERIALIZER.deserialize(o['total_amount']) or 0) if 'total_amount' in o else 0.0
+            total_revenue += amount
+            # Legacy orders may lack created_at; they sort as the oldest
+            created_at = o.get('created_at', {}).get('S', '')
+            if created_at.startswith(today):
+                today_orders += 1
+                today_revenue += amount
+            # order_number breaks created_at ties so the dicts are never compared
+            entry = (created_at, o['order_number']['S'], o)
+            if len(recent_heap) < 10:
+                heapq.heappush(recent_heap, entry)
+            elif entry > recent_heap[0]:
+                heapq.heapreplace(recent_heap, entry)
+        recent_orders = [{k: DESERIALIZER.deserialize(v) for k, v in entry[2].items()}
+                         for entry in sorted(recent_heap, reverse=True)]
         
         # Messages count (placeholder - not implemented yet)
         new_messages = 0
         
     except ClientError as e:
-        print(f"Admin dashboard error: {e}")
-        all_users = []
-        all_bakeries = []
-        all_orders = []
-        all_products = []
+        report_read_error("Admin dashboard", e)
         total_users = 0
         total_bakeries = 0
         total_orders = 0
@@ -1594,10 +2111,6 @@ def admin_dashboard():
         new_messages = 0
     
     return render_template('admin/dashboard.html',
-                          users=all_users,
-                          bakeries=all_bakeries,
-                          orders=all_orders,
-                          products=all_products,
                           total_users=total_users,
                           total_bakeries=total_bakeries,
                           total_orders=total_orders,
@@ -1614,97 +2127,62 @@ def admin_dashboard():
                           recent_orders=recent_orders,
                           new_messages=new_messages)
 
-@app.route('/bakeries/<slug>')
-def bakery_detail(slug):
-    """Public bakery detail page."""
-    try:
-        # Scan for bakery with this slug (Ideally use GSI)
-        response = bakeries_table.scan(
-            FilterExpression=Attr('slug').eq(slug)
-        )
-        items = response.get('Items', [])
-        bakery = items[0] if items else None
-        
-        if not bakery:
-            flash('Bakery not found.', 'error')
-            return redirect(url_for('index'))
-            
-        # Get approved products
-        products_response = products_table.scan(
-            FilterExpression=Attr('bakery_id').eq(bakery['bakery_id']) & Attr('is_available').eq(True)
-        )
-        products = products_response.get('Items', [])
-        
-        # Get reviews
-        try:
-            reviews_response = reviews_table.scan(
-                FilterExpression=Attr('bakery_id').eq(bakery['bakery_id'])
-            )
-            reviews = reviews_response.get('Items', [])
-        except ClientError:
-            reviews = []
-            
-    except ClientError as e:
-        print(f"Error fetching bakery: {e}")
-        flash('Error loading bakery.', 'error')
-        return redirect(url_for('index'))
-    
-    return render_template('main/bakery_detail.html', 
-                          bakery=bakery,
-                          products=products,
-                          reviews=reviews)
-
 @app.route('/admin/bakeries')
-@login_required
 @admin_required
 def admin_bakeries():
     """Admin bakeries management."""
+    cursor = request.args.get('cursor')
     try:
-        response = bakeries_table.scan()
-        all_bakeries = response.get('Items', [])
-    except ClientError:
-        all_bakeries = []
+        all_bakeries, next_cursor = read_page(bakeries_table.scan, cursor)
+    except ClientError as e:
+        report_read_error("Admin bakeries", e)
+        all_bakeries, next_cursor = [], None
     
-    return render_template('admin/bakeries.html', bakeries=all_bakeries)
+    return render_template('admin/bakeries.html',
+                          bakeries=all_bakeries,
+                          cursor=cursor,
+                          next_cursor=next_cursor)
 
 @app.route('/admin/bakeries/<bakery_id>/approve', methods=['POST'])
-@login_required
 @admin_required
 def admin_approve_bakery(bakery_id):
     """Approve bakery."""
     try:
-        bakeries_table.update_item(
+        # The updated item comes back with the write, for the notification; the condition
+        # keeps a repeated click from notifying twice and a stale one from creating an item
+        response = bakeries_table.update_item(
             Key={'bakery_id': bakery_id},
-            UpdateExpression='SET is_approved = :a',
-            ExpressionAttributeValues={':a': True}
+            UpdateExpression='SET is_approved = :a REMOVE pending',
+            ConditionExpression='attribute_exists(bakery_id) AND (attribute_not_exists(is_approved) OR is_approved = :f)',
+            ExpressionAttributeValues={':a': True, ':f': False},
+            ReturnValues='ALL_NEW'
         )
-        
-        # Get bakery details for notification
-        response = bakeries_table.get_item(Key={'bakery_id': bakery_id})
-        bakery = response.get('Item', {})
+        bakery = response.get('Attributes', {})
+        forget_bakery(bakery.get('owner_email'))
         
         send_notification("Bakery Approved", 
                          f"Bakery '{bakery.get('name', 'Unknown')}' has been approved!")
         
         flash('Bakery approved.', 'success')
     except ClientError as e:
-        print(f"Error approving bakery: {e}")
-        flash('Error approving bakery.', 'error')
+        if condition_failed(e):
+            flash('Bakery is already approved or no longer exists.', 'warning')
+        else:
+            print(f"Error approving bakery: {e}")
+            flash('Error approving bakery.', 'error')
     
     return redirect(request.referrer or url_for('admin_bakeries'))
 
 @app.route('/admin/bakeries/<bakery_id>/reject', methods=['POST'])
-@login_required
 @admin_required
 def admin_reject_bakery(bakery_id):
     """Reject bakery (delete it)."""
     try:
-        # Get bakery name for notification
-        response = bakeries_table.get_item(Key={'bakery_id': bakery_id})
-        bakery = response.get('Item', {})
+        # The deleted item comes back with the write, for the notification
+        response = bakeries_table.delete_item(Key={'bakery_id': bakery_id}, ReturnValues='ALL_OLD')
+        bakery = response.get('Attributes', {})
         bakery_name = bakery.get('name', 'Unknown')
-        
-        bakeries_table.delete_item(Key={'bakery_id': bakery_id})
+        forget_bakery(bakery.get('owner_email'))
         
         send_notification("Bakery Rejected", 
                          f"Bakery '{bakery_name}' has been rejected.")
@@ -1717,7 +2195,6 @@ def admin_reject_bakery(bakery_id):
     return redirect(url_for('admin_bakeries'))
 
 @app.route('/admin/bakeries/<bakery_id>/toggle_featured', methods=['POST'])
-@login_required
 @admin_required
 def admin_toggle_featured(bakery_id):
     """Toggle bakery featured status."""
@@ -1733,6 +2210,7 @@ def admin_toggle_featured(bakery_id):
                 UpdateExpression='SET is_featured = :f',
                 ExpressionAttributeValues={':f': new_status}
             )
+            forget_bakery(bakery.get('owner_email'))
             flash(f"Bakery {'featured' if new_status else 'unfeatured'}.", 'success')
     except ClientError as e:
         print(f"Error toggling featured status: {e}")
@@ -1741,11 +2219,16 @@ def admin_toggle_featured(bakery_id):
     return redirect(request.referrer or url_for('admin_bakeries'))
 
 @app.route('/admin/bakeries/<bakery_id>')
-@login_required
 @admin_required
 def admin_bakery_detail(bakery_id):
     """Admin bakery detail view."""
     try:
+        # The counts only need the id, so run them alongside the bakery read
+        bakery_key = Key('bakery_id').eq(bakery_id)
+        products_fut = EXECUTOR.submit(count_items, products_table.query, IndexName='bakery_id-index',
+                                       KeyConditionExpression=bakery_key)
+        orders_fut = EXECUTOR.submit(count_items, orders_table.query, IndexName='bakery_id-created_at-index',
+                                     KeyConditionExpression=bakery_key)
         response = bakeries_table.get_item(Key={'bakery_id': bakery_id})
         bakery = response.get('Item')
         
@@ -1753,16 +2236,8 @@ def admin_bakery_detail(bakery_id):
             flash('Bakery not found.', 'error')
             return redirect(url_for('admin_bakeries'))
             
-        # Get counts (using Scan with Filter - optimizing to Query later would be better)
-        products_response = products_table.scan(
-            FilterExpression=Attr('bakery_id').eq(bakery_id)
-        )
-        product_count = len(products_response.get('Items', []))
-        
-        orders_response = orders_table.scan(
-            FilterExpression=Attr('bakery_id').eq(bakery_id)
-        )
-        order_count = len(orders_response.get('Items', []))
+        product_count = products_fut.result()
+        order_count = orders_fut.result()
         
     except ClientError as e:
         print(f"Error fetching details: {e}")
@@ -1775,55 +2250,90 @@ def admin_bakery_detail(bakery_id):
                           order_count=order_count)
 
 @app.route('/admin/users')
-@login_required
 @admin_required
 def admin_users():
     """Admin users management."""
+    role_filter = request.args.get('role')
+    cursor = request.args.get('cursor')
     try:
-        response = users_table.scan()
-        all_users = response.get('Items', [])
-    except ClientError:
-        all_users = []
+        if role_filter:
+            all_users, next_cursor = read_page(users_table.query, cursor,
+                                               IndexName='role-index',
+                                               KeyConditionExpression=Key('role').eq(role_filter),
+                                               **projection(*USER_ADMIN_FIELDS))
+        else:
+            all_users, next_cursor = read_page(users_table.scan, cursor, **projection(*USER_ADMIN_FIELDS))
+    except ClientError as e:
+        report_read_error("Admin users", e)
+        all_users, next_cursor = [], None
     
-    return render_template('admin/users.html', users=all_users)
+    return render_template('admin/users.html',
+                          users=as_rows(UserRow, all_users),
+                          role_filter=role_filter,
+                          cursor=cursor,
+                          next_cursor=next_cursor)
 
 @app.route('/admin/users/<user_email>/toggle', methods=['POST'])
-@login_required
 @admin_required
 def admin_toggle_user(user_email):
     """Toggle user active status."""
     try:
-        response = users_table.get_item(Key={'email': user_email})
-        user = response.get('Item')
-        
-        if user:
-            new_status = not user.get('is_active', True)
-            users_table.update_item(
+        # Deactivate if active (the default) without a pre-read; a failed condition means reactivate
+        try:
+            response = users_table.update_item(
                 Key={'email': user_email},
-                UpdateExpression='SET is_active = :a',
-                ExpressionAttributeValues={':a': new_status}
+                UpdateExpression='SET is_active = :f',
+                ConditionExpression='attribute_exists(email) AND (attribute_not_exists(is_active) OR is_active = :t)',
+                ExpressionAttributeValues={':f': False, ':t': True},
+                ReturnValues='ALL_NEW'
             )
-            
-            status_text = 'activated' if new_status else 'deactivated'
-            flash(f"User {user.get('name', user_email)} has been {status_text}.", 'success')
+        except ClientError as e:
+            if not condition_failed(e):
+                raise
+            response = users_table.update_item(
+                Key={'email': user_email},
+                UpdateExpression='SET is_active = :t',
+                ConditionExpression='attribute_exists(email)',
+                ExpressionAttributeValues={':t': True},
+                ReturnValues='ALL_NEW'
+            )
+        user = response['Attributes']
+        
+        status_text = 'activated' if user['is_active'] else 'deactivated'
+        flash(f"User {user.get('name', user_email)} has been {status_text}.", 'success')
     except ClientError as e:
-        print(f"Toggle user error: {e}")
-        flash('Error updating user status.', 'danger')
+        if condition_failed(e):
+            flash('User not found.', 'danger')
+        else:
+            print(f"Toggle user error: {e}")
+            flash('Error updating user status.', 'danger')
     
     return redirect(url_for('admin_users'))
 
 @app.route('/admin/orders')
-@login_required
 @admin_required
 def admin_orders():
     """Admin orders management."""
+    status_filter = request.args.get('status')
+    cursor = request.args.get('cursor')
     try:
-        response = orders_table.scan()
-        all_orders = response.get('Items', [])
-    except ClientError:
-        all_orders = []
+        if status_filter:
+            all_orders, next_cursor = read_page(orders_table.query, cursor,
+                                                IndexName='status-created_at-index',
+                                                KeyConditionExpression=Key('status').eq(status_filter),
+                                                ScanIndexForward=False,
+                                                **projection(*ORDER_ADMIN_FIELDS))
+        else:
+            all_orders, next_cursor = read_page(orders_table.scan, cursor, **projection(*ORDER_ADMIN_FIELDS))
+    except ClientError as e:
+        report_read_error("Admin orders", e)
+        all_orders, next_cursor = [], None
     
-    return render_template('admin/orders.html', orders=all_orders)
+    return render_template('admin/orders.html',
+                          orders=as_rows(OrderRow, all_orders),
+                          status_filter=status_filter,
+                          cursor=cursor,
+                          next_cursor=next_cursor)
 
 # ==================== CUSTOMER PROFILE ROUTES ====================
 
@@ -1852,10 +2362,8 @@ def profile():
             flash('Error updating profile.', 'danger')
     
     try:
-        response = addresses_table.scan(
-            FilterExpression=Attr('user_email').eq(user_email)
-        )
-        user_addresses = response.get('Items', [])
+        user_addresses = query_index(addresses_table, 'user_email-index', Key('user_email').eq(user_email),
+                                     **projection(*ADDRESS_FIELDS))
     except ClientError:
         user_addresses = []
     
@@ -1894,7 +2402,8 @@ def add_address():
     """Add new address."""
     if request.method == 'POST':
         try:
-            address_id = str(uuid.uuid4())
+            address_id = new_ulid()
+            # is_default is only stored when set; a missing flag reads as false
             addresses_table.put_item(Item={
                 'address_id': address_id,
                 'user_email': session['user_email'],
@@ -1902,7 +2411,6 @@ def add_address():
                 'full_address': request.form.get('full_address'),
                 'city': request.form.get('city'),
                 'pincode': request.form.get('pincode'),
-                'is_default': False,
                 'created_at': datetime.utcnow().isoformat()
             })
             flash('Address added.', 'success')
@@ -1912,6 +2420,47 @@ def add_address():
     
     return render_template('customer/add_address.html')
 
+# ==================== MAINTENANCE COMMANDS ====================
+
+@app.cli.command('backfill-pending')
+def backfill_pending():
+    """Mark unapproved bakeries created before pending-index existed (safe to re-run)."""
+    unmarked = parallel_scan(
+        bakeries_table.scan,
+        FilterExpression=Attr('pending').not_exists() & (Attr('is_approved').not_exists() | Attr('is_approved').eq(False)),
+        **projection('bakery_id')
+    )
+    marked = 0
+    for bakery in unmarked:
+        try:
+            # Skip any bakery approved since the scan read it
+            bakeries_table.update_item(
+                Key={'bakery_id': bakery['bakery_id']},
+                UpdateExpression='SET pending = :p',
+                ConditionExpression='attribute_not_exists(is_approved) OR is_approved = :f',
+                ExpressionAttributeValues={':p': PENDING, ':f': False}
+            )
+            marked += 1
+        except ClientError as e:
+            if not condition_failed(e):
+                raise
+    print(f"Marked {marked} pending bakeries.")
+
+@app.cli.command('reconcile-stats')
+def reconcile_stats():
+    """Recount every bakery's running order stats from its orders (run periodically, e.g. nightly)."""
+    reconciled = 0
+    for bakery in parallel_scan(bakeries_table.scan, **projection('bakery_id')):
+        try:
+            # Skip any bakery deleted since the scan read it
+            write_bakery_stats(bakery['bakery_id'], count_bakery_stats(bakery['bakery_id']),
+                               'attribute_exists(bakery_id)')
+            reconciled += 1
+        except ClientError as e:
+            if not condition_failed(e):
+                raise
+    print(f"Reconciled stats for {reconciled} bakeries.")
+
 # ==================== ERROR HANDLERS ====================
 
 @app.errorhandler(404)